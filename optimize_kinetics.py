@@ -13,33 +13,51 @@ Experimental data CSV should have columns: z, deposition_rate
 
 import argparse
 import json
+import multiprocessing as mp
 import numpy as np
-import pandas as pd
-from scipy.optimize import least_squares
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from scipy.optimize import Bounds, least_squares, minimize
+from scipy.stats import qmc
 import os
 import logging
-from src.utils import calculate_metrics, interpolate_data
+from src.utils import calculate_metrics, interpolate_data, Interpolator
 
 from src.input_parser import get_inputs
-from src.model import simulate
+from src.model import simulate, axial_grid, _count_surface_reactions
+
+# Bounded LRU of residuals keyed on the rounded parameter vector; per process, cleared per fit
+OBJECTIVE_CACHE_SIZE = 256
+_objective_cache = OrderedDict()
 
 
 def load_experimental_data(exp_csv_path: str):
     """Load experimental deposition data."""
-    df = pd.read_csv(exp_csv_path)
-    if 'z' not in df.columns or 'deposition_rate' not in df.columns:
+    with open(exp_csv_path, 'r') as f:
+        header = [col.strip() for col in f.readline().strip().split(',')]
+    if 'z' not in header or 'deposition_rate' not in header:
         raise ValueError("Experimental CSV must have 'z' and 'deposition_rate' columns")
-    return df['z'].values, df['deposition_rate'].values
+    data = np.loadtxt(exp_csv_path, delimiter=',', skiprows=1, ndmin=2,
+                      usecols=(header.index('z'), header.index('deposition_rate')))
+    return data[:, 0], data[:, 1]
+
 
+def objective_function(params, inputs, mechanism_path, exp_z, exp_dep, objective_type='l2', interpolator=None):
+    """
+    Objective function for optimization.
 
-def objective_function(params, inputs, mechanism_path, exp_z, exp_dep, objective_type='l2'):
-    """Objective function for optimization."""
+    interpolator, if given, is an Interpolator from the simulation's axial grid onto exp_z,
+    so the interpolation search is not repeated on every call.
+    """
     try:
-        results = simulate(inputs, mechanism_path, kinetic_params=params)
+        results, _ = simulate(inputs, mechanism_path, kinetic_params=params)
         sim_dep = results.carbon_deposition_rate
 
         # Interpolate simulated data to experimental z points
-        sim_dep_interp = interpolate_data(results.z, sim_dep, exp_z)
+        if interpolator is not None:
+            sim_dep_interp = interpolator(sim_dep)
+        else:
+            sim_dep_interp = interpolate_data(results.z, sim_dep, exp_z)
 
         # Compute residuals
         residuals = sim_dep_interp - exp_dep
@@ -57,25 +75,154 @@ def objective_function(params, inputs, mechanism_path, exp_z, exp_dep, objective
         return np.full_like(exp_dep, 1e6)
 
 
-def optimize_kinetics(inputs, mechanism_path, exp_csv_path, n_reactions=None, objective_type='l2'):
-    """Perform kinetic parameter optimization."""
+def _cache_key(params):
+    return tuple(np.round(np.asarray(params, dtype=float), 8).tolist())
+
+
+def _cache_store(key, residuals):
+    _objective_cache[key] = residuals
+    if len(_objective_cache) > OBJECTIVE_CACHE_SIZE:
+        _objective_cache.popitem(last=False)
+
+
+def clear_objective_cache():
+    _objective_cache.clear()
+
+
+def cached_objective(params, *args):
+    """
+    objective_function memoized on the parameter vector rounded to 8 decimals.
+
+    The cache does not key on args, so it must be cleared (clear_objective_cache) before
+    fitting a different problem; fit_from_start does this.
+    """
+    key = _cache_key(params)
+    if key in _objective_cache:
+        _objective_cache.move_to_end(key)
+    else:
+        _cache_store(key, np.asarray(objective_function(params, *args)))
+    return _objective_cache[key].copy()
+
+
+def parallel_jacobian(params, args, upper_bounds, executor):
+    """
+    Forward-difference Jacobian of objective_function with the columns evaluated concurrently.
+
+    Args:
+        params: Point at which to evaluate the Jacobian.
+        args: Extra positional arguments for objective_function.
+        upper_bounds: Upper parameter bounds; steps that would cross them are flipped.
+        executor: concurrent.futures executor used to run the simulations.
+
+    Returns:
+        np.ndarray: Jacobian of shape (n_residuals, n_params).
+    """
+    params = np.asarray(params, dtype=float)
+    # Same step rule as scipy's '2-point' scheme
+    steps = np.sqrt(np.finfo(float).eps) * np.maximum(1.0, np.abs(params))
+    steps = np.where(params + steps > np.asarray(upper_bounds), -steps, steps)
+
+    points = [params]
+    for j, h in enumerate(steps):
+        perturbed = params.copy()
+        perturbed[j] += h
+        points.append(perturbed)
+
+    # Only simulate points that are not already cached; the base point usually is, since
+    # least_squares has just evaluated the residuals there
+    keys = [_cache_key(p) for p in points]
+    futures = {key: executor.submit(objective_function, p, *args)
+               for key, p in zip(keys, points) if key not in _objective_cache}
+    for key, future in futures.items():
+        _cache_store(key, np.asarray(future.result()))
+    f0, *f_perturbed = [_objective_cache[key] for key in keys]
+    return np.column_stack([(fj - f0) / h for fj, h in zip(f_perturbed, steps)])
+
+
+def parameter_space(n_reactions):
+    """
+    Initial guess and bounds for [logA1..logAn, Ea1..Ean] as numpy arrays.
+
+    Returns:
+        tuple: (initial_params, lower_bounds, upper_bounds)
+    """
+    # Initial guess: logA = 10, Ea = 50 kcal/mol for each reaction
+    initial_params = np.concatenate([np.full(n_reactions, 10.0), np.full(n_reactions, 50.0)])
+    # Expanded bounds: logA >= 0, Ea >= 1 kcal/mol, with reasonable upper limits
+    lower_bounds = np.concatenate([np.full(n_reactions, 0.0), np.full(n_reactions, 1.0)])
+    upper_bounds = np.concatenate([np.full(n_reactions, 20.0), np.full(n_reactions, 500.0)])
+    return initial_params, lower_bounds, upper_bounds
+
+
+def fit_from_start(x0, args, bounds, executor=None, method='trf'):
+    """
+    Run one bounded fit from x0.
+
+    method 'trf' runs least_squares on the residual vector; 'trust-constr' and 'L-BFGS-B' run
+    minimize on 0.5 * sum(residuals**2) with the gradient J.T @ r. If executor is given, the
+    finite-difference Jacobian columns are evaluated on it in parallel. Residuals are memoized
+    for the duration of the fit (see cached_objective).
+
+    Returns:
+        OptimizeResult: For the scalar methods, result.cost is set to the final objective value.
+    """
+    clear_objective_cache()
+
+    def jacobian(params, *fargs):
+        return parallel_jacobian(params, fargs, bounds[1], executor)
+
+    if method == 'trf':
+        return least_squares(
+            cached_objective,
+            x0,
+            jac='2-point' if executor is None else jacobian,
+            bounds=bounds,
+            args=args,
+            method='trf',
+            x_scale='jac',
+            ftol=1e-3,
+            xtol=1e-3,
+            gtol=1e-3,
+            max_nfev=100
+        )
+
+    def cost(params):
+        residuals = cached_objective(params, *args)
+        return 0.5 * float(residuals @ residuals)
+
+    def gradient(params):
+        return jacobian(params, *args).T @ cached_objective(params, *args)
+
+    result = minimize(
+        cost,
+        x0,
+        jac='2-point' if executor is None else gradient,
+        method=method,
+        bounds=Bounds(bounds[0], bounds[1]),
+        options={'maxiter': 100}
+    )
+    result.cost = float(result.fun)
+    return result
+
+
+def optimize_kinetics(inputs, mechanism_path, exp_csv_path, n_reactions=None, objective_type='l2',
+                      max_workers=None, n_starts=1, seed=None, method='trf'):
+    """
+    Perform kinetic parameter optimization.
+
+    method selects the solver used by fit_from_start ('trf', 'trust-constr' or 'L-BFGS-B').
+
+    With n_starts > 1, the default initial guess is complemented by Sobol-sampled starting points
+    within the bounds; the independent fits run in parallel and the lowest-cost result is returned.
+    """
     # Load experimental data
     exp_z, exp_dep = load_experimental_data(exp_csv_path)
 
     # Determine number of surface reactions if not provided
     if n_reactions is None:
-        # Quick simulation to get n_reactions
-        temp_results = simulate(inputs, mechanism_path)
-        # Assume surf is available; in practice, might need to load mechanism
-        # For now, hardcode or estimate
-        n_reactions = 4  # Example; adjust based on mechanism
-
-    # Initial guess: logA = 10, Ea = 50 kcal/mol for each reaction
-    initial_params = [10.0] * n_reactions + [50.0] * n_reactions  # logA + Ea_kcal
+        n_reactions = _count_surface_reactions(mechanism_path)
 
-    # Expanded bounds
-    lower_bounds = [0.0] * n_reactions + [1.0] * n_reactions  # logA >=0, Ea >=1 kcal/mol
-    upper_bounds = [20.0] * n_reactions + [500.0] * n_reactions  # reasonable upper limits
+    initial_params, lower_bounds, upper_bounds = parameter_space(n_reactions)
     bounds = (lower_bounds, upper_bounds)
 
     # Validate initial guess
@@ -83,17 +230,22 @@ def optimize_kinetics(inputs, mechanism_path, exp_csv_path, n_reactions=None, ob
         if not (lb <= p <= ub):
             logging.warning(f"Initial param {i} ({p}) is outside bounds [{lb}, {ub}]")
 
-    # Optimize
-    result = least_squares(
-        objective_function,
-        initial_params,
-        bounds=bounds,
-        args=(inputs, mechanism_path, exp_z, exp_dep, objective_type),
-        method='trf',
-        ftol=1e-6,
-        xtol=1e-6,
-        max_nfev=100
-    )
+    # The slice grid is fixed by the inputs, so the interpolation onto exp_z can be precomputed
+    interpolator = Interpolator(axial_grid(inputs), exp_z)
+
+    args = (inputs, mechanism_path, exp_z, exp_dep, objective_type, interpolator)
+    ctx = mp.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as executor:
+        if n_starts <= 1:
+            # Single fit; Jacobian columns are independent simulations, so run them in parallel
+            result = fit_from_start(initial_params, args, bounds, executor, method)
+        else:
+            # Multi-start; each fit runs serially in its own worker
+            sampler = qmc.Sobol(d=len(initial_params), seed=seed)
+            starts = qmc.scale(sampler.random(n_starts), lower_bounds, upper_bounds)
+            starts[0] = initial_params
+            futures = [executor.submit(fit_from_start, x0, args, bounds, None, method) for x0 in starts]
+            result = min((f.result() for f in futures), key=lambda r: r.cost)
 
     return result, exp_z, exp_dep
 
@@ -106,6 +258,11 @@ def main():
     parser.add_argument('-o', '--output', required=True, help='Output JSON file for optimized parameters')
     parser.add_argument('-n', '--n_reactions', type=int, help='Number of surface reactions (auto-detected if not provided)')
     parser.add_argument('--objective', choices=['l2', 'mae'], default='l2', help='Objective function type (default: l2)')
+    parser.add_argument('-j', '--workers', type=int, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--starts', type=int, default=1, help='Number of multi-start fits (default: 1)')
+    parser.add_argument('--seed', type=int, help='Seed for the multi-start Sobol sampler')
+    parser.add_argument('--method', choices=['trf', 'trust-constr', 'L-BFGS-B'], default='trf',
+                        help='Optimization method (default: trf)')
 
     args = parser.parse_args()
 
@@ -113,9 +270,11 @@ def main():
     inputs = get_inputs(args.config)
 
     # Run optimization
-    result, exp_z, exp_dep = optimize_kinetics(inputs, args.mechanism, args.experimental, args.n_reactions, args.objective)
+    result, exp_z, exp_dep = optimize_kinetics(inputs, args.mechanism, args.experimental, args.n_reactions, args.objective,
+                                               args.workers, args.starts, args.seed, args.method)
 
     # Check if optimized params hit bounds
+    _, lower_bounds, upper_bounds = parameter_space(len(result.x) // 2)
     bounds_hit = []
     for i, (p, lb, ub) in enumerate(zip(result.x, lower_bounds, upper_bounds)):
         if abs(p - lb) < 1e-3 or abs(p - ub) < 1e-3:
@@ -135,6 +294,8 @@ def main():
         'rmse': rmse,
         'mae': mae,
         'objective_type': args.objective,
+        'n_starts': args.starts,
+        'method': args.method,
         'bounds_hit': bounds_hit
     }
 
@@ -11,18 +11,53 @@ Usage:
 
 import argparse
 import json
+import multiprocessing as mp
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Dict, List
 
 from src.input_parser import get_inputs
-from src.model import simulate
+from src.model import simulate, build_reactor, run_slices, _count_surface_reactions
 from src.utils import plot_setup, save_plot
 
 
+# Reactor context built once per worker process by _init_worker
+_worker_reactor = None
+
+
+def _init_worker(inputs: Dict, mechanism_path: str) -> None:
+    global _worker_reactor
+    _worker_reactor = build_reactor(inputs, mechanism_path)
+
+
+def _simulate(inputs: Dict, mechanism_path: str, params: List[float]):
+    # Inside the pool, reuse the worker's reactor and only swap the surface kinetics
+    if _worker_reactor is not None:
+        return run_slices(_worker_reactor, params)
+    return simulate(inputs, mechanism_path, params)
+
+
+def _baseline_outputs(inputs: Dict, mechanism_path: str, base_params: List[float]) -> Dict:
+    """
+    Run the baseline simulation and extract the profiles used for differencing.
+
+    Returns:
+        Dict of numpy arrays ('deposition', 'temperature', 'z') that can be
+        shared with worker processes.
+    """
+    results_base, _ = simulate(inputs, mechanism_path, base_params)
+    return {
+        'deposition': np.asarray(results_base.carbon_deposition_rate),
+        'temperature': np.asarray(results_base.T),
+        'z': np.asarray(results_base.z)
+    }
+
+
 def compute_sensitivity(inputs: Dict, mechanism_path: str, base_params: List[float],
-                       param_idx: int, delta: float = 0.01) -> Dict:
+                       param_idx: int, delta: float = 0.01, scheme: str = 'forward',
+                       base_results: Dict = None) -> Dict:
     """
     Compute sensitivity for a single parameter using finite differences.
 
@@ -32,64 +67,84 @@ def compute_sensitivity(inputs: Dict, mechanism_path: str, base_params: List[flo
         base_params: Baseline kinetic parameters
         param_idx: Index of parameter to perturb
         delta: Relative perturbation size
+        scheme: 'forward' (one extra simulation) or 'central' (two extra simulations)
+        base_results: Baseline profiles from _baseline_outputs; simulated if omitted
 
     Returns:
         Dict with sensitivity data
     """
-    # Baseline simulation
-    results_base, _ = simulate(inputs, mechanism_path, base_params)
-    base_deposition = results_base.carbon_deposition_rate
-    base_temp = results_base.T
+    if scheme not in ('forward', 'central'):
+        raise ValueError(f"Unknown finite-difference scheme: '{scheme}'")
+
+    if base_results is None:
+        base_results = _baseline_outputs(inputs, mechanism_path, base_params)
 
     # Perturbed parameters
     params_plus = base_params.copy()
-    params_minus = base_params.copy()
     params_plus[param_idx] *= (1 + delta)
-    params_minus[param_idx] *= (1 - delta)
-
-    # Perturbed simulations
-    results_plus, _ = simulate(inputs, mechanism_path, params_plus)
-    results_minus, _ = simulate(inputs, mechanism_path, params_minus)
-
+    results_plus, _ = _simulate(inputs, mechanism_path, params_plus)
     plus_deposition = results_plus.carbon_deposition_rate
-    minus_deposition = results_minus.carbon_deposition_rate
     plus_temp = results_plus.T
-    minus_temp = results_minus.T
 
-    # Sensitivity coefficients (central difference)
-    dep_sens = (plus_deposition - minus_deposition) / (2 * delta * base_params[param_idx])
-    temp_sens = (plus_temp - minus_temp) / (2 * delta * base_params[param_idx])
+    if scheme == 'central':
+        params_minus = base_params.copy()
+        params_minus[param_idx] *= (1 - delta)
+        results_minus, _ = _simulate(inputs, mechanism_path, params_minus)
+        minus_deposition = results_minus.carbon_deposition_rate
+        minus_temp = results_minus.T
+        step = 2 * delta * base_params[param_idx]
+    else:
+        minus_deposition = base_results['deposition']
+        minus_temp = base_results['temperature']
+        step = delta * base_params[param_idx]
+
+    # Sensitivity coefficients
+    dep_sens = (plus_deposition - minus_deposition) / step
+    temp_sens = (plus_temp - minus_temp) / step
 
     return {
         'param_idx': param_idx,
         'param_value': base_params[param_idx],
         'deposition_sensitivity': dep_sens.tolist(),
         'temperature_sensitivity': temp_sens.tolist(),
-        'z': results_base.z.tolist()
+        'z': base_results['z'].tolist()
     }
 
 
 def run_sensitivity_analysis(inputs: Dict, mechanism_path: str, delta: float = 0.01,
-                           n_reactions: int = None) -> Dict:
+                           n_reactions: int = None, max_workers: int = None,
+                           scheme: str = 'forward') -> Dict:
     """
     Run full sensitivity analysis for all surface reaction parameters.
+
+    The baseline is simulated once and shared; each parameter is then
+    perturbed in a worker process that reuses its reactor network between
+    tasks, and results are returned ordered by parameter index.
     """
     # Determine number of reactions
     if n_reactions is None:
-        temp_results, _ = simulate(inputs, mechanism_path)
-        n_reactions = 4  # Default; could be auto-detected
+        n_reactions = _count_surface_reactions(mechanism_path)
 
     # Baseline parameters (same as optimization)
     base_params = [10.0] * n_reactions + [50.0] * n_reactions
-
-    sensitivities = []
-    for i in range(2 * n_reactions):
-        sens = compute_sensitivity(inputs, mechanism_path, base_params, i, delta)
-        sensitivities.append(sens)
+    base_results = _baseline_outputs(inputs, mechanism_path, base_params)
+
+    # Cantera objects are not fork-safe, so start clean interpreters
+    ctx = mp.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(inputs, mechanism_path)) as executor:
+        futures = [
+            executor.submit(compute_sensitivity, inputs, mechanism_path, base_params, i, delta,
+                            scheme, base_results)
+            for i in range(2 * n_reactions)
+        ]
+        sensitivities = [f.result() for f in as_completed(futures)]
+    sensitivities.sort(key=lambda sens: sens['param_idx'])
 
     return {
         'baseline_params': base_params,
         'delta': delta,
+        'scheme': scheme,
         'n_reactions': n_reactions,
         'sensitivities': sensitivities
     }
@@ -137,6 +192,9 @@ def main():
     parser.add_argument('--delta', type=float, default=0.01, help='Relative perturbation size (default: 0.01)')
     parser.add_argument('-n', '--n_reactions', type=int, help='Number of surface reactions')
     parser.add_argument('--plots', action='store_true', help='Generate sensitivity plots')
+    parser.add_argument('--scheme', choices=['forward', 'central'], default='forward',
+                        help='Finite-difference scheme (default: forward)')
+    parser.add_argument('-j', '--workers', type=int, help='Number of worker processes (default: CPU count)')
 
     args = parser.parse_args()
 
@@ -144,7 +202,8 @@ def main():
     inputs = get_inputs(args.config)
 
     # Run analysis
-    sens_data = run_sensitivity_analysis(inputs, args.mechanism, args.delta, args.n_reactions)
+    sens_data = run_sensitivity_analysis(inputs, args.mechanism, args.delta, args.n_reactions,
+                                         args.workers, args.scheme)
 
     # Save results
     with open(args.output, 'w') as f:
@@ -1,6 +1,37 @@
 import yaml
 from typing import Dict, Any
 from collections.abc import Mapping
+from pint import UnitRegistry
+ureg = UnitRegistry()
+
+_MISSING = object()
+
+
+def to_si(q):
+    return q.to_base_units().magnitude
+
+
+def si_value(param_value):
+    """
+    Reduce a [{'value': ...}, {'units': ...}] entry to its value in SI base units.
+
+    Dimensionless and string values (slice count, compositions) are returned as given, and
+    entries that are already plain values, or lists without a 'value' item, pass through unchanged.
+    """
+    if not isinstance(param_value, list):
+        return param_value
+    value = next((it['value'] for it in param_value if isinstance(it, Mapping) and 'value' in it), _MISSING)
+    if value is _MISSING:
+        return param_value
+    units = next((it['units'] for it in param_value if isinstance(it, Mapping) and 'units' in it), '')
+    if isinstance(value, str) or not units:
+        return value
+    return float(to_si(ureg.Quantity(value, units)))
+
+
+def inputs_to_si(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of the inputs with every entry reduced by si_value()."""
+    return {key: si_value(val) for key, val in data.items()}
 
 
 def _validate_list_of_pair(param_value, param_name: str) -> bool:
@@ -35,4 +66,5 @@ def get_inputs(config_path: str) -> Dict[str, Any]:
         raise ValueError("Config file is empty or invalid YAML.")
     # Validate basic input structure
     validate_inputs(data)
-    return data
+    # Convert units once here so simulate() does not repeat it on every call
+    return inputs_to_si(data)
@@ -1,28 +1,55 @@
 import cantera as ct
+import logging
 import numpy as np
-from pint import UnitRegistry
-ureg = UnitRegistry()
-def to_si(q):
-    return q.to_base_units().magnitude
+from dataclasses import dataclass
+from functools import lru_cache
+from .input_parser import si_value
+logger = logging.getLogger(__name__)
 
-def simulate(inputs, mechanism_path, kinetic_params=None, print_kinetics=False):
-    """
-    Simulate the PFR with surface reactions and deposition.
+# Integrator tolerances. Deposition (~1e-18 kg/m²/s) and trace coverages are tiny, so atol
+# must stay far below them; rtol=1e-11 tracks the 1e-12 profiles to ~1e-5 at less cost
+DEFAULT_RTOL = 1e-11
+DEFAULT_ATOL = 1e-24
 
-    Args:
-        inputs (dict): Configuration parameters (length, diameter, etc.).
-        mechanism_path (str): Path to Cantera mechanism YAML.
-        kinetic_params (list, optional): Kinetic parameters [logA1, logA2, ..., Ea1, Ea2, ...].
-        print_kinetics (bool): If True, print reaction kinetics.
 
-    Returns:
-        tuple: (results, energy_balance) where results is Cantera SolutionArray, energy_balance is float.
+def axial_grid(inputs):
+    """Return the axial position (m) of each slice recorded by simulate()."""
+    N = int(si_value(inputs['number_of_slices']))
+    return np.arange(N) * (si_value(inputs['length']) / N)
+
+
+def _load_phases(mechanism_path):
+    """
+    Build fresh gas, bulk and surface phases from the mechanism.
+
+    Cantera keeps parsed YAML files cached internally, so this is cheap (~ms) next to a
+    simulation. The phases are not reused across calls because simulate() mutates their
+    state and surface kinetics, and Cantera phase objects cannot be copied.
     """
-    # define mech and phases
     gas = ct.Solution(mechanism_path, name='gas')
     bulk = ct.Solution(mechanism_path, name='Cbulk')
     surf = ct.Interface(mechanism_path, name='surf', adjacent=[gas, bulk])
-    
+    return gas, bulk, surf
+
+
+@lru_cache(maxsize=None)
+def _count_surface_reactions(mechanism_path):
+    """Return the number of surface reactions in the mechanism without running a simulation."""
+    _, _, surf = _load_phases(mechanism_path)
+    return surf.n_reactions
+
+
+def set_kinetic_params(surf, kinetic_params, original_reactions):
+    """
+    Restore the mechanism's surface reactions, then apply kinetic_params if given.
+
+    Args:
+        surf: Cantera Interface holding the surface reactions.
+        kinetic_params (list or None): [logA1, logA2, ..., Ea1, Ea2, ...]; None keeps the mechanism rates.
+        original_reactions (list): surf.reactions() as loaded from the mechanism.
+    """
+    for i, reaction in enumerate(original_reactions):
+        surf.modify_reaction(i, reaction)
     # this was used to modify the kinetic parameters of the surface reactions for the optimization
     if kinetic_params is not None:
         # extract kinetic params from input
@@ -31,28 +58,37 @@ def simulate(inputs, mechanism_path, kinetic_params=None, print_kinetics=False):
         Eas = Eas * 4.184e6      # convert Ea from kcal/mol to J/mol
         # modify kinetics of surface reactions
         for i, A, Ea in zip(range(surf.n_reactions),As,Eas):
-            original_reaction = surf.reactions()[i]
+            original_reaction = original_reactions[i]
             new_rate = ct.InterfaceArrheniusRate(A=A, b=0, Ea=Ea)  # need to check units on input data
             modified_reaction = ct.Reaction(
                 reactants=original_reaction.reactants,
                 products=original_reaction.products,
                 rate=new_rate)
             surf.modify_reaction(i, modified_reaction)
-    if print_kinetics:
-        for i in range(surf.n_reactions):
-            print(surf.reactions()[i].input_data)
 
-    # set system parameters
-    length = ureg.Quantity(inputs['length'][0]['value'], inputs['length'][1]['units'])
-    diameter = ureg.Quantity(inputs['diameter'][0]['value'], inputs['diameter'][1]['units'])
-    power = ureg.Quantity(inputs['power'][0]['value'], inputs['power'][1]['units'])
-    volumetric_flow_rate = ureg.Quantity(inputs['volumetric_flow_rate'][0]['value'], inputs['volumetric_flow_rate'][1]['units'])
-    N = inputs['number_of_slices'][0]['value']
 
-    # convert to SI
-    d = to_si(diameter)
-    l = to_si(length)
-    heat_added = to_si(power)
+def build_reactor(inputs, mechanism_path, rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL):
+    """
+    Build the phases and reactor network for a PFR once, for repeated use with run_slices().
+
+    Args:
+        inputs (dict): Configuration parameters (length, diameter, etc.).
+        mechanism_path (str): Path to Cantera mechanism YAML.
+        rtol (float): Relative tolerance of the reactor network integrator.
+        atol (float): Absolute tolerance of the reactor network integrator.
+
+    Returns:
+        dict: Reactor context (phases, reactor network, inlet conditions and grid).
+    """
+    # define mech and phases
+    gas, bulk, surf = _load_phases(mechanism_path)
+
+    # set system parameters (SI); get_inputs() has usually converted these already
+    d = si_value(inputs['diameter'])
+    l = si_value(inputs['length'])
+    heat_added = si_value(inputs['power'])
+    volumetric_flow_rate = si_value(inputs['volumetric_flow_rate'])
+    N = int(si_value(inputs['number_of_slices']))
 
     # calculate additional parameters
     flow_area = 0.25 * np.pi * d * d
@@ -61,20 +97,20 @@ def simulate(inputs, mechanism_path, kinetic_params=None, print_kinetics=False):
     dz = l / N
 
     # set reference temp
-    T_ref = ureg.Quantity(inputs['reference_temperature'][0]['value'], inputs['reference_temperature'][1]['units'])
+    T_ref = si_value(inputs['reference_temperature'])
 
     # set Initial conditions
-    T0 = ureg.Quantity(inputs['T0'][0]['value'], inputs['T0'][1]['units'])
-    P0 = ureg.Quantity(inputs['P0'][0]['value'], inputs['P0'][1]['units'])
-    X0 = inputs['inlet_composition'][0]['value']
-    gas.TPX = to_si(T_ref), to_si(P0), X0
+    T0 = si_value(inputs['T0'])
+    P0 = si_value(inputs['P0'])
+    X0 = si_value(inputs['inlet_composition'])
+    gas.TPX = T_ref, P0, X0
     density_ref = gas.density_mass
-    gas.TPX = to_si(T0), to_si(P0), X0
-    mass_flow_rate = density_ref * to_si(volumetric_flow_rate)
+    gas.TPX = T0, P0, X0
+    mass_flow_rate = density_ref * volumetric_flow_rate
     mdot = mass_flow_rate
     H_in = gas.enthalpy_mass * mass_flow_rate
-    surf.TP = to_si(T0), to_si(P0)
-    surf.coverages = inputs['initial_coverages'][0]['value']
+    surf.TP = T0, P0
+    surf.coverages = si_value(inputs['initial_coverages'])
 
     # define reactor
     reactor = ct.Reactor(gas, clone=False)
@@ -92,33 +128,143 @@ def simulate(inputs, mechanism_path, kinetic_params=None, print_kinetics=False):
     v = ct.PressureController(reactor, downstream, primary=m, K=1e-5)
 
     sim = ct.ReactorNet([reactor])
-    sim.rtol = 1e-12  # relative tolerance
-    sim.atol = 1e-24  # absolute tolerance
-    soln = ct.SolutionArray(gas, extra=['z', 'surf_coverages', 'surf_rates', 'carbon_deposition_rate'])
-    # Propagate Cantera gas species names to the solution array for downstream output
-    soln._species_names = list(gas.species_names)
+    sim.rtol = rtol  # relative tolerance
+    sim.atol = atol  # absolute tolerance
+    try:
+        kC = surf.kinetics_species_index('C(B)')
+    except KeyError:
+        kC = 0  # fallback if 'C(B)' not found
+
+    return {
+        'gas': gas, 'bulk': bulk, 'surf': surf, 'reactor': reactor, 'rsurf': rsurf,
+        'upstream': upstream, 'sim': sim, 'kC': kC,
+        # keep the flow devices alive with the network
+        'devices': (heat_reservoir, wall, m, downstream, v),
+        'original_reactions': surf.reactions(),
+        'inlet_state': (T0, P0, X0), 'initial_coverages': surf.coverages,
+        'mass_flow_rate': mass_flow_rate, 'H_in': H_in, 'heat_added': heat_added,
+        'N': N, 'dz': dz,
+    }
+
+
+def run_slices(ctx, kinetic_params=None, print_kinetics=False):
+    """
+    Reset a reactor context from build_reactor() to the inlet state and march it through the slices.
 
+    Args:
+        ctx (dict): Reactor context from build_reactor().
+        kinetic_params (list, optional): Kinetic parameters [logA1, logA2, ..., Ea1, Ea2, ...].
+        print_kinetics (bool): If True, print reaction kinetics.
+
+    Returns:
+        tuple: (results, energy_balance) where results is Cantera SolutionArray, energy_balance is float.
+    """
+    gas, bulk, surf = ctx['gas'], ctx['bulk'], ctx['surf']
+    reactor, rsurf, upstream, sim = ctx['reactor'], ctx['rsurf'], ctx['upstream'], ctx['sim']
+    kC, N, dz = ctx['kC'], ctx['N'], ctx['dz']
+    mass_flow_rate = ctx['mass_flow_rate']
+
+    set_kinetic_params(surf, kinetic_params, ctx['original_reactions'])
+    if print_kinetics:
+        for i in range(surf.n_reactions):
+            print(surf.reactions()[i].input_data)
+
+    # start from the inlet; a previous run leaves the reactor at the outlet state
+    T0, P0, X0 = ctx['inlet_state']
+    gas.TPX = T0, P0, X0
+    reactor.syncState()
+    surf.TP = T0, P0
+    rsurf.coverages = ctx['initial_coverages']
+    surf_phase = rsurf.phase
+
+    # preallocate per-slice outputs; the SolutionArray is assembled once after the loop
+    z_arr = np.arange(N) * dz
+    T_arr = np.empty(N)
+    D_arr = np.empty(N)
+    Y_arr = np.empty((N, gas.n_species))
+    cov_arr = np.empty((N, surf.n_species))
+    rates_arr = np.empty((N, surf.n_reactions))
+    dep_arr = np.empty(N)
+
+    # The slices are marched in order: each slice's inlet is the previous slice's steady outlet, so
+    # the system is lower-triangular and a parallel (Jacobi-style) sweep over all slices only moves
+    # the inlet information one slice per pass, i.e. ~N passes instead of one serial march.
     for ri in range(N):
-        wdot = rsurf.phase.net_production_rates
-        try:
-            kC = surf.kinetics_species_index('C(B)')
-        except KeyError:
-            kC = 0  # fallback if 'C(B)' not found
-        soln.append(TDY=reactor.phase.TDY, z=ri*dz, surf_coverages=rsurf.coverages, surf_rates=surf.net_rates_of_progress, carbon_deposition_rate=wdot[kC])
+        T_arr[ri], D_arr[ri], Y_arr[ri] = reactor.phase.TDY
+        cov_arr[ri] = rsurf.coverages
+        rates_arr[ri] = surf.net_rates_of_progress
+        dep_arr[ri] = surf_phase.net_production_rates[kC]
         # Set the state of the reservoir to match that of the previous reactor
         upstream.syncState()
-            
-        # integrate the reactor forward in time until steady state is reached
+
+        # integrate the reactor forward in time until steady state is reached. reinitialize() is
+        # required: the new inlet changes the right-hand side, and carrying the old CVODES history
+        # over fails with corrector convergence errors.
         sim.reinitialize()
         sim.advance_to_steady_state()  # runs until energy balance is achieved.
-        
+
         #sim.advance(100000)  # this advances to a time, but results in less heat added (q_dot * dt)
+    # outlet enthalpy must be read before the SolutionArray below changes the shared gas state
     H_out = gas.enthalpy_mass * mass_flow_rate
+
+    soln = ct.SolutionArray(gas, shape=N, extra={'z': z_arr, 'surf_coverages': cov_arr, 'surf_rates': rates_arr, 'carbon_deposition_rate': dep_arr})
+    soln.TDY = T_arr, D_arr, Y_arr
+    # Propagate Cantera gas species names to the solution array for downstream output
+    soln._species_names = list(gas.species_names)
     mass_bulk = np.trapezoid(soln.carbon_deposition_rate, soln.z)
-    Ebal = (H_in + heat_added) / (H_out + bulk.enthalpy_mass * mass_bulk)
+    Ebal = (ctx['H_in'] + ctx['heat_added']) / (H_out + bulk.enthalpy_mass * mass_bulk)
 
     # Check energy balance
     if abs(Ebal - 1.0) > 0.01:
         logger.warning(f"Energy balance not conserved (Ebal = {Ebal:.4f}, expected ~1.0)")
 
-    return soln, Ebal
\ No newline at end of file
+    return soln, Ebal
+
+
+def simulate(inputs, mechanism_path, kinetic_params=None, print_kinetics=False,
+             rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL):
+    """
+    Simulate the PFR with surface reactions and deposition.
+
+    Args:
+        inputs (dict): Configuration parameters (length, diameter, etc.).
+        mechanism_path (str): Path to Cantera mechanism YAML.
+        kinetic_params (list, optional): Kinetic parameters [logA1, logA2, ..., Ea1, Ea2, ...].
+        print_kinetics (bool): If True, print reaction kinetics.
+        rtol (float): Relative tolerance of the reactor network integrator.
+        atol (float): Absolute tolerance of the reactor network integrator.
+
+    Returns:
+        tuple: (results, energy_balance) where results is Cantera SolutionArray, energy_balance is float.
+    """
+    return run_slices(build_reactor(inputs, mechanism_path, rtol, atol), kinetic_params, print_kinetics)
+
+
+@dataclass
+class ResultsArrays:
+    """
+    Plain-array (struct-of-arrays) copy of a simulate() SolutionArray.
+
+    Field names mirror the SolutionArray attributes, so the object can stand in for the
+    results in the output writers; it pickles small and holds no Cantera objects.
+    """
+    z: np.ndarray
+    T: np.ndarray
+    density: np.ndarray
+    Y: np.ndarray
+    surf_coverages: np.ndarray
+    surf_rates: np.ndarray
+    carbon_deposition_rate: np.ndarray
+    species_names: tuple
+
+    @classmethod
+    def from_solution(cls, soln):
+        def arr(a):
+            return np.ascontiguousarray(a, dtype=np.float64)
+        return cls(z=arr(soln.z), T=arr(soln.T), density=arr(soln.density), Y=arr(soln.Y),
+                   surf_coverages=arr(soln.surf_coverages), surf_rates=arr(soln.surf_rates),
+                   carbon_deposition_rate=arr(soln.carbon_deposition_rate),
+                   species_names=tuple(getattr(soln, '_species_names', soln.species_names)))
+
+    def __len__(self):
+        return len(self.z)
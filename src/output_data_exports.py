@@ -1,76 +1,42 @@
-import json
-import os
 import numpy as np
 import pandas as pd
+from .output_writer import _write_df
 
 
-def _as_list(x):
-    try:
-        return list(x)
-    except Exception:
-        return [x]
+def _column(soln, name: str, n: int = 0) -> np.ndarray:
+    # Pull a whole per-slice array at once; NaN-filled when the field is absent
+    vals = getattr(soln, name, None)
+    if vals is None:
+        return np.full(n, np.nan)
+    return np.asarray(vals, dtype=float)
 
 
 def export_temperature_vs_z(soln, csv_path: str) -> str:
-    n = len(soln)
-    z = getattr(soln, 'z', None)
-    rows = []
-    for i in range(n):
-        if z is None:
-            # cannot compute z; skip
-            continue
-        row = {'slice': i, 'z': z[i]}
-        tdy = getattr(soln[i], 'TDY', None)
-        if tdy is not None:
-            try:
-                row['T'] = float(tdy[0])
-            except Exception:
-                row['T'] = None
-        else:
-            row['T'] = None
-        rows.append(row)
-    df = pd.DataFrame(rows)
-    os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
-    df.to_csv(csv_path, index=False)
-    return csv_path
+    z = _column(soln, 'z')
+    T = _column(soln, 'T', len(z))
+    df = pd.DataFrame({'slice': np.arange(len(z)), 'z': z, 'T': T})
+    return _write_df(df, csv_path)
 
 
 def export_deposition_vs_z(soln, csv_path: str) -> str:
-    n = len(soln)
-    z = getattr(soln, 'z', None)
-    dep_vals = getattr(soln, 'carbon_deposition_rate', None)
-    rows = []
-    for i in range(n):
-        if z is None:
-            continue
-        val = None
-        if dep_vals is not None:
-            try:
-                val = float(dep_vals[i])
-            except Exception:
-                val = None
-        rows.append({'slice': i, 'z': z[i], 'carbon_deposition_rate': val})
-    df = pd.DataFrame(rows)
-    os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
-    df.to_csv(csv_path, index=False)
-    return csv_path
+    z = _column(soln, 'z')
+    dep = _column(soln, 'carbon_deposition_rate', len(z))
+    df = pd.DataFrame({'slice': np.arange(len(z)), 'z': z, 'carbon_deposition_rate': dep})
+    return _write_df(df, csv_path)
 
 
 def export_composition_vs_z(soln, csv_path: str) -> str:
-    n = len(soln)
-    z = getattr(soln, 'z', None)
-    rows = []
-    for i in range(n):
-        if z is None:
-            continue
-        row = {'slice': i, 'z': z[i]}
-        if hasattr(soln[i], 'Y'):
-            yv = getattr(soln[i], 'Y')
-            row['Y'] = _as_list(yv)
-        else:
-            row['Y'] = None
-        rows.append(row)
-    df = pd.DataFrame(rows)
-    os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
-    df.to_csv(csv_path, index=False)
-    return csv_path
+    z = _column(soln, 'z')
+    Y = getattr(soln, 'Y', None)
+    Y = np.empty((len(z), 0)) if Y is None else np.asarray(Y, dtype=float).reshape(len(z), -1)
+    # simulate() attaches the gas species names as _species_names
+    species_names = getattr(soln, '_species_names', None)
+    if species_names is None:
+        species_names = getattr(soln, 'species_names', None)
+    if species_names is None or len(species_names) != Y.shape[1]:
+        species_names = [f'species_{i}' for i in range(Y.shape[1])]
+    df = pd.concat([
+        pd.DataFrame({'slice': np.arange(len(z)), 'z': z}),
+        pd.DataFrame(Y, columns=[f'Y_{name}' for name in species_names]),
+    ], axis=1)
+    return _write_df(df, csv_path)
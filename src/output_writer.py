@@ -1,7 +1,14 @@
+import io
 import json
 import os
 import numpy as np
 import pandas as pd
+from .utils import _ensure_dir
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def _to_python(obj):
@@ -16,42 +23,207 @@ def _to_python(obj):
     return obj
 
 
+def _dumps(obj) -> str:
+    # orjson encodes numpy arrays and scalars natively in C; stdlib json
+    # needs them converted to Python objects first
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass
+    return json.dumps(_to_python(obj))
+
+
 def _derive_species_names(soln):
-    # Prefer explicit names if available
-    if hasattr(soln, '_species_names'):
-        sn = getattr(soln, '_species_names')
-        if isinstance(sn, (list, tuple)):
-            return [str(n) for n in sn]
-    if hasattr(soln, 'species_names'):
-        sn = getattr(soln, 'species_names')
-        if isinstance(sn, (list, tuple)):
-            return [str(n) for n in sn]
-    # Try to derive from first slice composition
-    if len(soln) > 0:
-        comp = getattr(soln[0], 'composition', None)
-        if isinstance(comp, dict):
-            return sorted(str(k) for k in comp.keys())
-        Y0 = getattr(soln[0], 'Y', None)
-        if isinstance(Y0, (list, tuple, np.ndarray)):
-            return [f'species_{i}' for i in range(len(Y0))]
-        # If Y is a JSON string, try to parse it to get length
-        if isinstance(Y0, str):
-            try:
-                parsed = json.loads(Y0)
-                if isinstance(parsed, (list, tuple, np.ndarray)):
-                    return [f'species_{i}' for i in range(len(parsed))]
-            except Exception:
-                pass
+    # Prefer explicit names; constant for a whole SolutionArray
+    sn = getattr(soln, '_species_names', None)
+    if not isinstance(sn, (list, tuple)):
+        sn = getattr(soln, 'species_names', None)
+    if isinstance(sn, (list, tuple)):
+        return [str(n) for n in sn]
+    if len(soln) == 0:
+        return None
+    # Fall back to one pass over the slice compositions
+    rows = [soln[i] for i in range(len(soln))]
+    names = {str(k) for c in (getattr(r, 'composition', None) for r in rows)
+             if isinstance(c, dict) for k in c}
+    if names:
+        return sorted(names)
+    # Otherwise number species by the length of the first slice's Y
+    Y0 = _as_vector(getattr(rows[0], 'Y', None))
+    if Y0 is not None and Y0.size:
+        return [f'species_{i}' for i in range(len(Y0))]
+    return None
+
+
+def _as_vector(Y):
+    # Per-slice Y may be an array/list or a JSON string of one
+    if isinstance(Y, str):
         try:
-            if Y0 is not None and hasattr(Y0, '__len__'):
-                n = len(Y0)
-                if n > 0:
-                    return [f'species_{i}' for i in range(n)]
+            Y = json.loads(Y)
         except Exception:
-            pass
+            return None
+    if isinstance(Y, (list, tuple, np.ndarray)):
+        try:
+            return np.asarray(Y, dtype=float).ravel()
+        except (TypeError, ValueError):
+            return None
     return None
 
 
+def _write_df(df: pd.DataFrame, csv_path: str) -> str:
+    """Write a DataFrame to CSV, using pyarrow's C++ writer when it is installed."""
+    _ensure_dir(os.path.dirname(csv_path))
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df.to_csv(csv_path, index=False)
+        return csv_path
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except pa.ArrowException:
+        # Mixed-type object columns (e.g. the ragged JSON fallback)
+        df.to_csv(csv_path, index=False)
+        return csv_path
+    pacsv.write_csv(table, csv_path)
+    return csv_path
+
+
+def _matrix_columns(field, M):
+    # One column per trailing element of an (n, ...) array: field_0 … field_k
+    M = M.reshape(M.shape[0], -1)
+    return {f'{field}_{j}': M[:, j] for j in range(M.shape[1])}
+
+
+def _field_columns(field, vals):
+    """Expand per-slice field values into numeric output columns.
+
+    Fixed-length arrays become ``field_0 … field_k`` columns and scalars a
+    single ``field`` column; ragged or missing values fall back to JSON.
+    """
+    if isinstance(vals, np.ndarray):
+        # Already a whole (n,) or (n, ...) numeric array
+        if vals.ndim == 1:
+            return {field: vals}
+        return _matrix_columns(field, vals)
+    arrs = [np.asarray(v) if isinstance(v, (list, tuple, np.ndarray)) and np.ndim(v) > 0 else None
+            for v in vals]
+    # Probe first, middle and last slice before stacking everything;
+    # np.stack still rejects any other slice whose shape differs
+    probe = {None if a is None else a.shape for a in (arrs[0], arrs[len(arrs) // 2], arrs[-1])} if arrs else set()
+    if len(probe) == 1 and None not in probe:
+        try:
+            return _matrix_columns(field, np.stack(arrs))
+        except ValueError:
+            pass
+    if all(a is None for a in arrs):
+        return {field: np.array(vals, dtype=object)}
+    col = np.empty(len(vals), dtype=object)
+    for i, (v, a) in enumerate(zip(vals, arrs)):
+        col[i] = _dumps(a) if a is not None else v
+    return {field: col}
+
+
+def _bulk(soln, name: str, n: int):
+    # Whole-array attribute with one numeric entry per slice, else None
+    vals = getattr(soln, name, None)
+    if vals is None or isinstance(vals, str):
+        return None
+    try:
+        arr = np.asarray(vals)
+    except Exception:
+        return None
+    if arr.ndim == 0 or arr.shape[0] != n or arr.dtype == object:
+        return None
+    return arr
+
+
+def _result_columns(soln) -> dict:
+    # Build column-oriented: one preallocated array per output column
+    n = len(soln)
+    z = getattr(soln, 'z', None)
+    species_names = _derive_species_names(soln)
+
+    # Each soln[i] builds a fresh per-slice view; only fetch rows when a
+    # field is not available as a whole array, and then only once
+    _rows = []
+
+    def rows():
+        if not _rows:
+            _rows.extend(soln[i] for i in range(n))
+        return _rows
+
+    # Which per-slice attributes exist is probed once, on the first slice;
+    # all slices of a results object share one layout
+    _fields = {}
+
+    def has_field(name):
+        if name not in _fields:
+            _fields[name] = n > 0 and hasattr(rows()[0], name)
+        return _fields[name]
+
+    columns = {'slice': np.arange(n)}
+    if z is not None:
+        columns['z'] = np.asarray(z)
+
+    T_arr = _bulk(soln, 'T', n)
+    D_arr = _bulk(soln, 'density', n)
+    if T_arr is None or D_arr is None:
+        # Temperature and density from per-slice TDY
+        T_arr = np.full(n, np.nan)
+        D_arr = np.full(n, np.nan)
+        for i, row in enumerate(rows() if has_field('TDY') else ()):
+            tdy = row.TDY
+            if tdy is not None:
+                try:
+                    T_arr[i] = float(tdy[0])
+                    D_arr[i] = float(tdy[1])
+                except Exception:
+                    pass
+    columns['T'] = T_arr
+    columns['D'] = D_arr
+
+    if species_names is not None:
+        shape = (n, len(species_names))
+        Y_all = _bulk(soln, 'Y', n)
+        if Y_all is not None and Y_all.shape == shape:
+            # Whole (n, n_species) block in one contiguous copy
+            species_mat = np.empty(shape)
+            np.copyto(species_mat, Y_all, casting='unsafe')
+        else:
+            species_mat = np.full(shape, np.nan)
+            species_idx = {sp: j for j, sp in enumerate(species_names)}
+            use_comp = has_field('composition') and isinstance(rows()[0].composition, dict)
+            for i, row in enumerate(rows() if use_comp or has_field('Y') else ()):
+                if use_comp:
+                    for k, v in row.composition.items():
+                        j = species_idx.get(str(k))
+                        if j is not None:
+                            species_mat[i, j] = v
+                else:
+                    # Populate from Y
+                    Y_row = _as_vector(row.Y)
+                    if Y_row is not None:
+                        k = min(Y_row.size, shape[1])
+                        species_mat[i, :k] = Y_row[:k]
+        columns.update(zip(species_names, species_mat.T))
+    else:
+        Y_col = np.empty(n, dtype=object)
+        attr = 'Y' if has_field('Y') else 'composition' if has_field('composition') else None
+        if attr is not None:
+            Y_col[:] = [_dumps(getattr(row, attr)) for row in rows()]
+        columns['Y'] = Y_col
+
+    for field in ['surf_coverages','surf_rates','carbon_deposition_rate']:
+        vals = _bulk(soln, field, n)
+        if vals is None:
+            vals = [getattr(row, field) for row in rows()] if has_field(field) else [None] * n
+        columns.update(_field_columns(field, vals))
+
+    return columns
+
+
 def write_results_to_csv(soln, csv_path: str) -> str:
     """
     Write simulation results to CSV with per-species columns.
@@ -63,75 +235,63 @@ def write_results_to_csv(soln, csv_path: str) -> str:
     Returns:
         str: The CSV file path.
     """
-    """Serialize per-slice results to CSV with per-species composition columns when available."""
-    n = len(soln)
-    z = getattr(soln, 'z', None)
-    species_names = _derive_species_names(soln)
-    rows = []
-    for i in range(n):
-        row = {'slice': i}
-        if z is not None:
-            row['z'] = z[i]
-        # TDY
-        tdy = getattr(soln[i], 'TDY', None)
-        if tdy is not None:
-            row['TDY'] = json.dumps(_to_python(tdy))
-            try:
-                row['T'] = float(tdy[0])
-            except Exception:
-                row['T'] = None
-        else:
-            row['TDY'] = None
-            row['T'] = None
-
-        if species_names is not None:
-            for sp in species_names:
-                row[sp] = None
-            comp = getattr(soln[i], 'composition', None)
-            if isinstance(comp, dict):
-                for k, v in comp.items():
-                    key = str(k)
-                    if key in species_names:
-                        row[key] = v
-            else:
-                # Try to populate from Y when available
-                Y = getattr(soln[i], 'Y', None)
-                # If Y is a JSON string, parse it
-                Y_list = None
-                if isinstance(Y, str):
-                    try:
-                        parsed = json.loads(Y)
-                        if isinstance(parsed, (list, tuple, np.ndarray)):
-                            Y_list = list(parsed)
-                    except Exception:
-                        Y_list = None
-                elif isinstance(Y, (list, tuple, np.ndarray)):
-                    Y_list = list(Y)
-                if Y_list is not None:
-                    for idx, val in enumerate(Y_list):
-                        if idx < len(species_names):
-                            row[species_names[idx]] = val
-        else:
-            if hasattr(soln[i], 'Y'):
-                row['Y'] = json.dumps(_to_python(getattr(soln[i], 'Y')))
-            elif hasattr(soln[i], 'composition'):
-                comp = getattr(soln[i], 'composition')
-                row['Y'] = json.dumps(_to_python(comp))
-            else:
-                row['Y'] = None
-
-        for field in ['surf_coverages','surf_rates','carbon_deposition_rate']:
-            if hasattr(soln[i], field):
-                val = getattr(soln[i], field)
-                if isinstance(val, np.ndarray):
-                    row[field] = json.dumps(val.tolist())
-                else:
-                    row[field] = val
-            else:
-                row[field] = None
-        rows.append(row)
-
-    df = pd.DataFrame(rows)
-    os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
-    df.to_csv(csv_path, index=False)
-    return csv_path
+    return _write_df(pd.DataFrame(_result_columns(soln)), csv_path)
+
+
+def results_to_csv_bytes(soln) -> bytes:
+    """
+    Serialize simulation results to CSV in memory, with the same columns as write_results_to_csv.
+
+    Args:
+        soln: Cantera SolutionArray.
+
+    Returns:
+        bytes: UTF-8 encoded CSV.
+    """
+    # Encode straight into a byte buffer instead of building an intermediate str
+    buf = io.BytesIO()
+    pd.DataFrame(_result_columns(soln)).to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+def write_results_to_parquet(soln, parquet_path: str) -> str:
+    """
+    Write simulation results to a zstd-compressed Parquet file (requires pyarrow).
+
+    The columns are the same as write_results_to_csv, but stored as a columnar
+    binary table built directly from the result arrays.
+
+    Args:
+        soln: Cantera SolutionArray.
+        parquet_path (str): Output Parquet file path.
+
+    Returns:
+        str: The Parquet file path.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from e
+    _ensure_dir(os.path.dirname(parquet_path))
+    pq.write_table(pa.Table.from_pydict(_result_columns(soln)), parquet_path, compression='zstd')
+    return parquet_path
+
+
+def write_results(soln, out_path: str) -> str:
+    """
+    Write simulation results, choosing the format from the file suffix.
+
+    Args:
+        soln: Cantera SolutionArray.
+        out_path (str): Output path ending in .csv or .parquet.
+
+    Returns:
+        str: The output file path.
+    """
+    ext = os.path.splitext(out_path)[1].lower()
+    if ext == '.parquet':
+        return write_results_to_parquet(soln, out_path)
+    if ext == '.csv':
+        return write_results_to_csv(soln, out_path)
+    raise ValueError(f"Unsupported results format '{ext}'; use .csv or .parquet")
@@ -1,20 +1,39 @@
-import matplotlib.pyplot as plt
+import os
 import numpy as np
 from typing import Any, Dict, Optional
-from .utils import plot_setup, save_plot
+from .utils import _ensure_dir
 
 
-def _safe_get(obj: Any, name: str, default: Any = None) -> Any:
-    return getattr(obj, name, default)
+# One Figure/canvas pair reused by every create_plots call; bypasses the
+# pyplot state machine and the cost of building a new Figure each time.
+# Built on first use so simulation-only runs never import matplotlib.
+_fig = None
+
+# Headless rendering settings: a bundled font (no font-cache lookups), no
+# glyph hinting, and aggressive path simplification for dense profiles.
+# Applied per call via rc_context so importers' global rcParams are untouched.
+_RC = {
+    'font.family': 'DejaVu Sans',
+    'text.hinting': 'none',
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+}
 
 
-def _to1d(a):
-    if a is None:
-        return None
-    arr = np.asarray(a)
-    if arr.ndim > 1:
-        arr = arr.ravel()
-    return arr
+def _mpl():
+    """Import matplotlib on first use; return the shared Figure and rc_context."""
+    global _fig
+    from matplotlib import rc_context
+    if _fig is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        _fig = Figure(figsize=(5, 3))
+        FigureCanvasAgg(_fig)
+    return _fig, rc_context
+
+
+def _safe_get(obj: Any, name: str, default: Any = None) -> Any:
+    return getattr(obj, name, default)
 
 
 def create_plots(results: Any, mechanism_path: str, output_dir: Optional[str] = None, variables: Optional[list] = None) -> Dict[str, str]:
@@ -28,74 +47,80 @@ def create_plots(results: Any, mechanism_path: str, output_dir: Optional[str] =
         variables (list, optional): List of variables to plot (e.g., ['temperature', 'RP2']).
 
     Returns:
-        dict: Mapping of plot names to file paths.
+        dict: Mapping of plot names to file paths; all requested variables are
+            drawn as panels of a single 'profiles' figure.
     """
     # Attempt to extract common plotted series from the Cantera SolutionArray
     z = _safe_get(results, 'z', None)
     dep = _safe_get(results, 'carbon_deposition_rate', None)
     if dep is None:
         dep = _safe_get(results, 'Cdep', None)
-    T = None
-    if hasattr(results, 'TDY'):
+    # Prefer T; TDY would also assemble the whole density and Y arrays
+    T = _safe_get(results, 'T', None)
+    if T is None and hasattr(results, 'TDY'):
         T = getattr(results, 'TDY')[0]  # Temperature is first element of TDY
-    elif hasattr(results, 'T'):
-        T = getattr(results, 'T')
     species_names = getattr(results, '_species_names', [])
 
-    out_dir = output_dir or __import__('os').path.dirname(mechanism_path)
-    import os
-    if not os.path.isdir(out_dir):
-        os.makedirs(out_dir, exist_ok=True)
+    out_dir = output_dir or os.path.dirname(mechanism_path)
+    _ensure_dir(out_dir)
 
-    plots = {}
-    z_arr = _to1d(z)
+    # Flatten z once; every series must supply one value per z point
+    z_arr = None if z is None else np.ascontiguousarray(np.ravel(z))
+    n = 0 if z_arr is None else z_arr.size
+    if n == 0:
+        return {}
+
+    def _on_z(a):
+        if a is None:
+            return None
+        arr = np.ravel(a)
+        return arr if arr.size == n else None
 
     # Default variables if none specified
     if variables is None:
         variables = ['temperature', 'deposition']
 
+    # Gather every series that shares the z axis, then render them as
+    # panels of one figure so Agg draws and encodes a single PNG
+    series = []
+    Y = None
     for var in variables:
         if var == 'temperature':
-            T_arr = _to1d(T)
-            if z_arr is not None and T_arr is not None and z_arr.size > 0 and T_arr.size > 0 and z_arr.shape[0] == T_arr.shape[0]:
-                plt.figure()
-                plt.plot(z_arr, T_arr, label='temperature')
-                plt.xlabel('z (m)')
-                plt.ylabel('temperature (K)')
-                plt.title('Temperature Profile')
-                out_path = os.path.join(out_dir, 'temperature_vs_z.png')
-                plt.savefig(out_path, dpi=150)
-                plots['temperature_vs_z'] = out_path
-                plt.close()
+            T_arr = _on_z(T)
+            if T_arr is not None:
+                series.append((T_arr, 'temperature', 'temperature (K)', 'Temperature Profile'))
         elif var == 'deposition':
-            dep_arr = _to1d(dep)
-            if z_arr is not None and dep_arr is not None and z_arr.size > 0 and dep_arr.size > 0 and z_arr.shape[0] == dep_arr.shape[0]:
-                plt.figure()
-                plt.plot(z_arr, dep_arr, label='deposition rate')
-                plt.xlabel('z (m)')
-                plt.ylabel('Deposition Rate (kg/m²/s)')
-                plt.title('Deposition Rate vs. Length')
-                out_path = os.path.join(out_dir, 'deposition_vs_z.png')
-                plt.savefig(out_path, dpi=150)
-                plots['deposition_vs_z'] = out_path
-                plt.close()
+            dep_arr = _on_z(dep)
+            if dep_arr is not None:
+                series.append((dep_arr, 'deposition rate', 'Deposition Rate (kg/m²/s)', 'Deposition Rate vs. Length'))
         elif var in species_names:
             # Plot species mass fraction
             idx = species_names.index(var)
-            y_arr = []
-            for row in results:
-                if hasattr(row, 'TDY') and len(row.TDY) > 2 and len(row.TDY[2]) > idx:
-                    y_arr.append(row.TDY[2][idx])
-                else:
-                    y_arr.append(0)
-            y_arr = np.array(y_arr)
-            if z_arr is not None and y_arr.size > 0 and z_arr.shape[0] == y_arr.shape[0]:
-                fig, ax = plot_setup()
-                ax.plot(z_arr, y_arr, label=f'{var} mass fraction')
-                ax.set_xlabel('z (m)')
-                ax.set_ylabel(f'{var} mass fraction')
-                ax.set_title(f'{var} vs. Length')
-                plots[f'{var}_vs_z'] = save_plot(fig, f'{var}_vs_z.png', out_dir)
+            if Y is None:
+                Y = _safe_get(results, 'Y', None)
+                Y = np.empty((0, 0)) if Y is None else np.asarray(Y)
+            if Y.ndim == 2 and Y.shape[1] > idx:
+                y_arr = _on_z(Y[:, idx])
+            else:
+                y_arr = np.zeros(n)
+            if y_arr is not None:
+                series.append((y_arr, f'{var} mass fraction', f'{var} mass fraction', f'{var} vs. Length'))
         # Add more variables if needed (e.g., surface coverages)
 
-    return plots
+    if not series:
+        return {}
+
+    fig, rc_context = _mpl()
+    with rc_context(_RC):
+        fig.clear()
+        fig.set_size_inches(5 * len(series), 3)
+        axes = fig.subplots(1, len(series), squeeze=False)
+        for ax, (y_arr, label, ylabel, title) in zip(axes[0], series):
+            ax.plot(z_arr, y_arr, label=label, rasterized=True)
+            ax.set_xlabel('z (m)')
+            ax.set_ylabel(ylabel)
+            ax.set_title(title)
+        fig.tight_layout()
+        out_path = os.path.join(out_dir, 'profiles.png')
+        fig.savefig(out_path, dpi=150)
+    return {'profiles': out_path}
@@ -3,9 +3,13 @@ Utility functions for the PFR project.
 """
 
 import logging
-import matplotlib.pyplot as plt
+import math
+import os
 import numpy as np
 
+# Absolute paths of directories already created by _ensure_dir in this process
+_ensured_dirs = set()
+
 
 def setup_logging(level=logging.INFO):
     """Set up logging with consistent format."""
@@ -15,42 +19,47 @@ def setup_logging(level=logging.INFO):
     )
 
 
+# (predicate, message) per validate_inputs argument, in signature order
+_CHECKS = (
+    (lambda v: v <= 0, "Length must be positive."),
+    (lambda v: v <= 0, "Diameter must be positive."),
+    (lambda v: v < 0, "Power must be non-negative."),
+    (lambda v: v <= 0, "Flow rate must be positive."),
+    (lambda v: v < 0, "Inlet temperature must be positive."),
+    (lambda v: v <= 0, "Inlet pressure must be positive."),
+    (lambda v: v < 10, "Number of slices must be at least 10."),
+    (lambda v: not v.strip(), "Inlet composition cannot be empty."),
+    (lambda v: not v.strip(), "Initial coverages cannot be empty."),
+    (lambda v: v < 0, "Reference temperature must be positive."),
+)
+
+
 def validate_inputs(length_val, diameter_val, power_val, flow_val, T0_val, P0_val, slices, inlet_comp, initial_cov, T_ref):
     """Validate input parameters and return list of errors."""
-    errors = []
-    if length_val <= 0:
-        errors.append("Length must be positive.")
-    if diameter_val <= 0:
-        errors.append("Diameter must be positive.")
-    if power_val < 0:
-        errors.append("Power must be non-negative.")
-    if flow_val <= 0:
-        errors.append("Flow rate must be positive.")
-    if T0_val < 0:
-        errors.append("Inlet temperature must be positive.")
-    if P0_val <= 0:
-        errors.append("Inlet pressure must be positive.")
-    if slices < 10:
-        errors.append("Number of slices must be at least 10.")
-    if not inlet_comp.strip():
-        errors.append("Inlet composition cannot be empty.")
-    if not initial_cov.strip():
-        errors.append("Initial coverages cannot be empty.")
-    if T_ref < 0:
-        errors.append("Reference temperature must be positive.")
-    return errors
+    vals = (length_val, diameter_val, power_val, flow_val, T0_val, P0_val, slices, inlet_comp, initial_cov, T_ref)
+    return [msg for (pred, msg), val in zip(_CHECKS, vals) if pred(val)]
+
+
+def _ensure_dir(path):
+    """Create a directory once per process; repeat calls for the same path skip the filesystem."""
+    path = os.path.abspath(path or '.')
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+    return path
 
 
 def plot_setup(figsize=(5, 3)):
     """Set up matplotlib figure and axis."""
+    import matplotlib.pyplot as plt
     fig, ax = plt.subplots(figsize=figsize)
     return fig, ax
 
 
 def save_plot(fig, filename, output_dir, dpi=150):
     """Save plot to file."""
-    import os
-    os.makedirs(output_dir, exist_ok=True)
+    import matplotlib.pyplot as plt
+    _ensure_dir(output_dir)
     path = os.path.join(output_dir, filename)
     fig.savefig(path, dpi=dpi)
     plt.close(fig)
@@ -59,11 +68,51 @@ def save_plot(fig, filename, output_dir, dpi=150):
 
 def calculate_metrics(residuals):
     """Calculate RMSE and MAE from residuals."""
-    rmse = np.sqrt(np.mean(residuals**2))
-    mae = np.mean(np.abs(residuals))
+    residuals = np.ravel(np.asarray(residuals, dtype=float))
+    n = residuals.size
+    if n == 0:
+        return np.nan, np.nan
+    # np.dot sums the squares without materializing residuals**2
+    rmse = math.sqrt(float(np.dot(residuals, residuals)) / n)
+    mae = float(np.abs(residuals).mean())
     return rmse, mae
 
 
 def interpolate_data(x_sim, y_sim, x_exp):
     """Interpolate simulated data to experimental points."""
-    return np.interp(x_exp, x_sim, y_sim)
\ No newline at end of file
+    return np.interp(x_exp, x_sim, y_sim)
+
+
+def interpolation_weights(x_grid, x_query):
+    """
+    Precompute linear-interpolation indices and weights of x_query on a fixed, sorted x_grid.
+
+    y_grid[idx - 1] * (1 - w) + y_grid[idx] * w then matches np.interp(x_query, x_grid, y_grid),
+    including clamping to the end values outside the grid.
+    """
+    x_grid = np.asarray(x_grid, dtype=float)
+    x_query = np.asarray(x_query, dtype=float)
+    idx = np.clip(np.searchsorted(x_grid, x_query, side='right'), 1, len(x_grid) - 1)
+    x0 = x_grid[idx - 1]
+    x1 = x_grid[idx]
+    w = np.clip((x_query - x0) / (x1 - x0), 0.0, 1.0)
+    return idx, w
+
+
+class Interpolator:
+    """
+    Linear interpolation from a fixed x_grid onto fixed x_query points, for many y_grid arrays.
+
+    The bracketing indices and weights are found once; each call is then a single
+    fused expression, y[idx - 1] + w * (y[idx] - y[idx - 1]), equivalent to
+    np.interp(x_query, x_grid, y_grid).
+    """
+
+    def __init__(self, x_grid, x_query):
+        self.idx, self.w = interpolation_weights(x_grid, x_query)
+        self._lo = self.idx - 1
+
+    def __call__(self, y_grid):
+        y_grid = np.asarray(y_grid, dtype=float)
+        y_lo = y_grid[self._lo]
+        return y_lo + self.w * (y_grid[self.idx] - y_lo)
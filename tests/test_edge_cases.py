@@ -2,6 +2,7 @@ import unittest
 import os
 from src.model import simulate
 from src.input_parser import get_inputs
+from src.utils import validate_inputs
 
 
 class TestEdgeCases(unittest.TestCase):
@@ -27,6 +28,12 @@ class TestEdgeCases(unittest.TestCase):
         self.assertIsNotNone(results)
         self.assertTrue(len(results) > 0)
 
+    def test_validate_inputs_reports_each_bad_value(self):
+        self.assertEqual(validate_inputs(1.0, 0.01, 0.0, 1.0, 300.0, 1e5, 10, 'RP2:1', 'X:1', 300.0), [])
+        errors = validate_inputs(0.0, 0.01, -1.0, 1.0, 300.0, 1e5, 5, 'RP2:1', ' ', 300.0)
+        self.assertEqual(errors, ["Length must be positive.", "Power must be non-negative.",
+                                  "Number of slices must be at least 10.", "Initial coverages cannot be empty."])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -55,6 +55,23 @@ class TestInputParserValidation(unittest.TestCase):
             self.assertIsInstance(data, dict)
             for key in ['length','diameter','power','volumetric_flow_rate','T0','P0','number_of_slices']:
                 self.assertIn(key, data)
+            # values are converted to SI base units
+            self.assertAlmostEqual(data['length'], 24.0 * 0.0254)
+            self.assertAlmostEqual(data['volumetric_flow_rate'], 53.9e-6 / 60)
+            self.assertEqual(data['number_of_slices'], 101)
+            self.assertEqual(data['inlet_composition'], 'RP2:1.0')
+        finally:
+            os.remove(path)
+
+    def test_extra_list_key_passes_through(self):
+        config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
+        with open(config_path) as f:
+            content = f.read()
+        path = self._write_yaml(content + "\n\nspecies:\n - RP2\n - H2\n")
+        try:
+            data = get_inputs(path)
+            self.assertEqual(data['species'], ['RP2', 'H2'])
+            self.assertAlmostEqual(data['length'], 24.0 * 0.0254)
         finally:
             os.remove(path)
 
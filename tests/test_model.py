@@ -1,6 +1,9 @@
 import unittest
 import os
-from src.model import simulate
+import numpy as np
+import pickle
+from src.model import simulate, axial_grid, build_reactor, run_slices, _count_surface_reactions, ResultsArrays
+from src.output_writer import results_to_csv_bytes
 from src.input_parser import get_inputs
 
 
@@ -21,6 +24,7 @@ class TestModelSimulation(unittest.TestCase):
         self.assertTrue(len(results.z) > 0)
         self.assertTrue(len(results.T) > 0)
         self.assertAlmostEqual(ebal, 1.0, delta=0.01)
+        np.testing.assert_allclose(results.z, axial_grid(inputs))
 
     def test_simulation_with_kinetic_params(self):
         # Test with dummy kinetic params
@@ -35,6 +39,72 @@ class TestModelSimulation(unittest.TestCase):
         self.assertIsNotNone(results)
         self.assertTrue(hasattr(results, 'z'))
 
+    def test_reused_reactor_matches_fresh_simulation(self):
+        config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
+        mechanism_path = os.path.join(os.path.dirname(__file__), '..', 'mech', 'RP2_surf.yaml')
+
+        inputs = get_inputs(config_path)
+        kinetic_params = [12.0] * 4 + [40.0] * 4
+        ctx = build_reactor(inputs, mechanism_path)
+        run_slices(ctx, kinetic_params)
+        # a second run must start from the inlet with the mechanism's own kinetics restored
+        reused, _ = run_slices(ctx)
+        fresh, _ = simulate(inputs, mechanism_path)
+
+        np.testing.assert_allclose(reused.T, fresh.T, rtol=1e-8)
+        np.testing.assert_allclose(reused.carbon_deposition_rate, fresh.carbon_deposition_rate, rtol=1e-6, atol=1e-30)
+
+    def test_default_tolerances_match_tight_tolerances(self):
+        config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
+        mechanism_path = os.path.join(os.path.dirname(__file__), '..', 'mech', 'RP2_surf.yaml')
+
+        inputs = get_inputs(config_path)
+        results, ebal = simulate(inputs, mechanism_path)
+        tight, ebal_tight = simulate(inputs, mechanism_path, rtol=1e-12, atol=1e-24)
+
+        np.testing.assert_allclose(results.T, tight.T, rtol=1e-6)
+        np.testing.assert_allclose(results.Y, tight.Y, rtol=1e-4, atol=1e-10)
+        np.testing.assert_allclose(results.carbon_deposition_rate, tight.carbon_deposition_rate, rtol=1e-4, atol=0)
+        self.assertAlmostEqual(ebal, ebal_tight, delta=1e-6)
+
+    def test_default_tolerances_resolve_perturbed_kinetics(self):
+        # The optimizer and sensitivity analysis run at ±1% around fitted parameters, where
+        # deposition (~1e-18 kg/m²/s) and coverages sit far below a loose absolute tolerance
+        config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
+        mechanism_path = os.path.join(os.path.dirname(__file__), '..', 'mech', 'RP2_surf.yaml')
+
+        inputs = get_inputs(config_path)
+        base_params = [10.0] * 4 + [50.0] * 4
+        base, _ = simulate(inputs, mechanism_path, base_params)
+        base_tight, _ = simulate(inputs, mechanism_path, base_params, rtol=1e-12, atol=1e-24)
+        for idx, factor in ((0, 1.01), (4, 0.99), (5, 0.99)):
+            params = list(base_params)
+            params[idx] *= factor
+            results, _ = simulate(inputs, mechanism_path, params)
+            tight, _ = simulate(inputs, mechanism_path, params, rtol=1e-12, atol=1e-24)
+
+            scale = np.abs(tight.carbon_deposition_rate).max()
+            np.testing.assert_allclose(results.carbon_deposition_rate, tight.carbon_deposition_rate, rtol=0, atol=1e-4 * scale)
+            # forward-difference numerator, as formed by compute_sensitivity; parameters the
+            # deposition barely depends on are held to the 1e-5 integration noise floor
+            diff = results.carbon_deposition_rate - base.carbon_deposition_rate
+            diff_tight = tight.carbon_deposition_rate - base_tight.carbon_deposition_rate
+            np.testing.assert_allclose(diff, diff_tight, rtol=0,
+                                       atol=1e-2 * np.abs(diff_tight).max() + 1e-5 * scale)
+
+    def test_count_surface_reactions(self):
+        mechanism_path = os.path.join(os.path.dirname(__file__), '..', 'mech', 'RP2_surf.yaml')
+        self.assertEqual(_count_surface_reactions(mechanism_path), 4)
+
+    def test_results_arrays_stand_in_for_solution_array(self):
+        config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
+        mechanism_path = os.path.join(os.path.dirname(__file__), '..', 'mech', 'RP2_surf.yaml')
+        results, _ = simulate(get_inputs(config_path), mechanism_path)
+        arrays = pickle.loads(pickle.dumps(ResultsArrays.from_solution(results)))
+        self.assertEqual(len(arrays), len(results))
+        self.assertEqual(list(arrays.species_names), list(results._species_names))
+        self.assertEqual(results_to_csv_bytes(arrays), results_to_csv_bytes(results))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -2,7 +2,10 @@ import unittest
 import tempfile
 import os
 import numpy as np
-from optimize_kinetics import objective_function, load_experimental_data
+from unittest import mock
+import optimize_kinetics
+from optimize_kinetics import objective_function, load_experimental_data, cached_objective, clear_objective_cache
+from src.utils import interpolation_weights, calculate_metrics, Interpolator
 
 
 class TestOptimization(unittest.TestCase):
@@ -26,6 +29,28 @@ class TestOptimization(unittest.TestCase):
         finally:
             os.unlink(csv_path)
 
+    def test_load_experimental_data_reorders_columns(self):
+        content = "deposition_rate,note,z\n1e-6,a,0.1\n"
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write(content)
+            csv_path = f.name
+        try:
+            z, dep = load_experimental_data(csv_path)
+            np.testing.assert_array_equal(z, [0.1])
+            np.testing.assert_array_equal(dep, [1e-6])
+        finally:
+            os.unlink(csv_path)
+
+    def test_load_experimental_data_missing_column_raises(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write("z,rate\n0.0,0.0\n")
+            csv_path = f.name
+        try:
+            with self.assertRaises(ValueError):
+                load_experimental_data(csv_path)
+        finally:
+            os.unlink(csv_path)
+
     def test_objective_function(self):
         from src.input_parser import get_inputs
         inputs = get_inputs(self.config_path)
@@ -38,6 +63,30 @@ class TestOptimization(unittest.TestCase):
         # Should not crash, residuals should be finite
         self.assertTrue(np.all(np.isfinite(residuals)))
 
+    def test_cached_objective_skips_repeat_evaluations(self):
+        clear_objective_cache()
+        with mock.patch.object(optimize_kinetics, 'objective_function', return_value=np.array([1.0, 2.0])) as fn:
+            first = cached_objective(np.array([10.0, 50.0]), 'args')
+            second = cached_objective(np.array([10.0 + 1e-10, 50.0]), 'args')
+            cached_objective(np.array([10.1, 50.0]), 'args')
+        clear_objective_cache()
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(fn.call_count, 2)
+
+    def test_interpolation_weights_match_interp(self):
+        z_grid = np.arange(11) * 0.1
+        dep = np.linspace(0.0, 1e-6, 11) ** 2
+        exp_z = np.array([-0.1, 0.0, 0.05, 0.33, 1.0, 1.5])
+        idx, w = interpolation_weights(z_grid, exp_z)
+        np.testing.assert_allclose(dep[idx - 1] * (1 - w) + dep[idx] * w, np.interp(exp_z, z_grid, dep))
+        np.testing.assert_allclose(Interpolator(z_grid, exp_z)(dep), np.interp(exp_z, z_grid, dep))
+
+    def test_calculate_metrics(self):
+        residuals = np.array([3.0, -4.0])
+        rmse, mae = calculate_metrics(residuals)
+        self.assertAlmostEqual(rmse, np.sqrt(12.5))
+        self.assertAlmostEqual(mae, 3.5)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,41 @@
+import unittest
+import tempfile
+import os
+import numpy as np
+import pandas as pd
+from src.output_data_exports import export_composition_vs_z, export_deposition_vs_z
+
+
+class _FakeSoln:
+    def __init__(self):
+        self.z = np.array([0.0, 0.5, 1.0])
+        self.Y = np.array([[1.0, 0.0], [0.6, 0.4], [0.2, 0.8]])
+        self._species_names = ['RP2', 'H2']
+        self.carbon_deposition_rate = np.array([0.0, 1e-9, 2e-9])
+
+    def __len__(self):
+        return len(self.z)
+
+
+class TestOutputDataExports(unittest.TestCase):
+
+    def test_composition_has_numeric_species_columns(self):
+        soln = _FakeSoln()
+        with tempfile.TemporaryDirectory() as d:
+            csv_path = export_composition_vs_z(soln, os.path.join(d, 'composition_vs_z.csv'))
+            df = pd.read_csv(csv_path)
+        self.assertEqual(list(df.columns), ['slice', 'z', 'Y_RP2', 'Y_H2'])
+        np.testing.assert_allclose(df[['Y_RP2', 'Y_H2']].values, soln.Y)
+
+    def test_deposition_columns(self):
+        soln = _FakeSoln()
+        with tempfile.TemporaryDirectory() as d:
+            csv_path = export_deposition_vs_z(soln, os.path.join(d, 'deposition_vs_z.csv'))
+            df = pd.read_csv(csv_path)
+        self.assertEqual(list(df.columns), ['slice', 'z', 'carbon_deposition_rate'])
+        np.testing.assert_array_equal(df['slice'], [0, 1, 2])
+        np.testing.assert_allclose(df['carbon_deposition_rate'], soln.carbon_deposition_rate)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,20 @@
+import json
 import unittest
 import tempfile
 import os
 import pandas as pd
-from src.output_writer import write_results_to_csv
+import numpy as np
+import io
+from src.output_writer import write_results_to_csv, write_results, results_to_csv_bytes, _field_columns
 from src.model import simulate
 from src.input_parser import get_inputs
 
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 
 class TestOutputWriter(unittest.TestCase):
 
@@ -22,7 +31,7 @@ class TestOutputWriter(unittest.TestCase):
 
         try:
             df = pd.read_csv(csv_path)
-            expected_cols = ['slice', 'z', 'T', 'TDY']
+            expected_cols = ['slice', 'z', 'T', 'D']
             for col in expected_cols:
                 self.assertIn(col, df.columns)
             # Check species columns exist (from _species_names)
@@ -45,6 +54,71 @@ class TestOutputWriter(unittest.TestCase):
         finally:
             os.unlink(csv_path)
 
+    @staticmethod
+    def _bulk_only():
+        class _BulkOnly:
+            _species_names = ['A', 'B']
+            z = np.array([0.0, 0.5])
+            T = np.array([700.0, 710.0])
+            density = np.array([1.0, 0.9])
+            Y = np.array([[1.0, 0.0], [0.6, 0.4]])
+            surf_coverages = np.array([[0.9, 0.1], [0.8, 0.2]])
+            surf_rates = np.zeros((2, 3))
+            carbon_deposition_rate = np.array([0.0, 1e-6])
+
+            def __len__(self):
+                return 2
+
+            def __getitem__(self, i):
+                raise AssertionError('per-slice access')
+
+        return _BulkOnly()
+
+    def test_bulk_arrays_written_without_row_access(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            df = pd.read_csv(write_results_to_csv(self._bulk_only(), os.path.join(tmp, 'r.csv')))
+        self.assertEqual(list(df['B']), [0.0, 0.4])
+        self.assertEqual(list(df['surf_coverages_1']), [0.1, 0.2])
+        self.assertEqual(list(df['T']), [700.0, 710.0])
+
+    def test_csv_bytes_match_csv_file(self):
+        soln = self._bulk_only()
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(write_results_to_csv(soln, os.path.join(tmp, 'r.csv')), 'rb') as f:
+                on_disk = f.read()
+        in_memory = results_to_csv_bytes(soln)
+        pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(in_memory)), pd.read_csv(io.BytesIO(on_disk)))
+
+    def test_write_results_dispatches_on_suffix(self):
+        soln = self._bulk_only()
+        with tempfile.TemporaryDirectory() as tmp:
+            df = pd.read_csv(write_results(soln, os.path.join(tmp, 'r.csv')))
+            self.assertIn('surf_rates_2', df.columns)
+            with self.assertRaises(ValueError):
+                write_results(soln, os.path.join(tmp, 'r.txt'))
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow not installed')
+    def test_write_results_parquet_matches_csv(self):
+        soln = self._bulk_only()
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_df = pd.read_csv(write_results(soln, os.path.join(tmp, 'r.csv')))
+            pq_df = pd.read_parquet(write_results(soln, os.path.join(tmp, 'r.parquet')))
+        self.assertEqual(list(pq_df.columns), list(csv_df.columns))
+        np.testing.assert_allclose(pq_df['T'], csv_df['T'])
+
+    def test_field_columns_expand_fixed_length_arrays(self):
+        cols = _field_columns('surf_coverages', [np.array([0.9, 0.1]), np.array([0.8, 0.2])])
+        self.assertEqual(list(cols), ['surf_coverages_0', 'surf_coverages_1'])
+        np.testing.assert_allclose(cols['surf_coverages_1'], [0.1, 0.2])
+
+    def test_field_columns_flatten_rectangular_2d_slices(self):
+        cols = _field_columns('surf_rates', [np.ones((2, 2)), np.zeros((2, 2)), np.ones((2, 2))])
+        self.assertEqual(list(cols), [f'surf_rates_{j}' for j in range(4)])
+
+    def test_field_columns_fall_back_to_json_for_ragged_arrays(self):
+        cols = _field_columns('surf_rates', [np.array([1.0]), np.array([1.0, 2.0])])
+        self.assertEqual([json.loads(c) for c in cols['surf_rates']], [[1.0], [1.0, 2.0]])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,30 @@
+import unittest
+import os
+from sensitivity_analysis import compute_sensitivity, _baseline_outputs
+from src.input_parser import get_inputs
+
+
+class TestSensitivity(unittest.TestCase):
+
+    def setUp(self):
+        self.config_path = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
+        self.mechanism_path = os.path.join(os.path.dirname(__file__), '..', 'mech', 'RP2_surf.yaml')
+        self.base_params = [10.0] * 4 + [50.0] * 4
+
+    def test_unknown_scheme_raises(self):
+        inputs = get_inputs(self.config_path)
+        with self.assertRaises(ValueError):
+            compute_sensitivity(inputs, self.mechanism_path, self.base_params, 0, scheme='backward')
+
+    def test_forward_sensitivity_uses_shared_baseline(self):
+        inputs = get_inputs(self.config_path)
+        base_results = _baseline_outputs(inputs, self.mechanism_path, self.base_params)
+        sens = compute_sensitivity(inputs, self.mechanism_path, self.base_params, 0,
+                                   scheme='forward', base_results=base_results)
+        self.assertEqual(sens['param_idx'], 0)
+        self.assertEqual(len(sens['deposition_sensitivity']), len(base_results['z']))
+        self.assertEqual(len(sens['temperature_sensitivity']), len(base_results['z']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,246 @@
 import streamlit as st
+import atexit
+import hashlib
+import shutil
 import tempfile
 import os
-import matplotlib.pyplot as plt
 import numpy as np
-import traceback
-import io
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 import time
 import logging
 
-from src.model import simulate
-from src.utils import validate_inputs, plot_setup, save_plot
-from src.output_writer import write_results_to_csv
+from src.model import simulate, ResultsArrays
+from src.utils import validate_inputs
+
+# matplotlib, pandas and the CSV writer are imported where they are first
+# needed, so a cold start or hot-reload without results does not pay for them
+
+
+@st.cache_resource
+def _executor():
+    # Streamlit re-executes this script on every rerun, so the pool is held as a
+    # cached resource: one background worker per server process
+    return ThreadPoolExecutor(max_workers=1)
+
+
+def _remove_quietly(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _remove_all(paths):
+    for path in list(paths):
+        _remove_quietly(path)
+
+
+@st.cache_resource
+def _temp_mechanisms():
+    # Temp mechanism files still on disk, across all sessions; one exit handler
+    # removes whatever is left, including files of sessions that have ended
+    paths = set()
+    atexit.register(_remove_all, paths)
+    return paths
+
+
+def _release_mechanism(path):
+    """Delete a temp mechanism file, unless a queued simulation still reads it."""
+    job = st.session_state.get('sim_job')
+    if job and job['mechanism_path'] == path:
+        return  # removed when the job is collected
+    _remove_quietly(path)
+    _temp_mechanisms().discard(path)
+
+
+# Entry cap for the process-wide st.cache_data caches, which every session shares
+_CACHE_ENTRIES = 16
+
+# Chunk size for hashing and copying uploads without buffering them whole
+_UPLOAD_CHUNK = 1 << 20
+
+
+def _upload_digest(upload):
+    """blake2b hex digest of an uploaded file, without buffering it whole."""
+    upload.seek(0)
+    try:
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: hashes the upload's buffer through a memoryview
+            return hashlib.file_digest(upload, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+        h = hashlib.blake2b(digest_size=16)
+        for chunk in iter(lambda: upload.read(_UPLOAD_CHUNK), b""):
+            h.update(chunk)
+        return h.hexdigest()
+    finally:
+        upload.seek(0)
+
+
+def _mechanism_file(upload, mech_hash):
+    """
+    Return a temp-file path holding the uploaded mechanism.
+
+    Streamlit reruns the script on every widget change, so the file is only
+    rewritten when the upload's content hash changes; the previous file is
+    released then (see _release_mechanism), and any file still tracked is
+    removed at process exit.
+    """
+    path = st.session_state.get('mechanism_path')
+    if st.session_state.get('mech_hash') == mech_hash and path and os.path.exists(path):
+        return path
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".yaml") as mf:
+        upload.seek(0)
+        shutil.copyfileobj(upload, mf, length=_UPLOAD_CHUNK)
+    _temp_mechanisms().add(mf.name)
+    if path:
+        _release_mechanism(path)
+    st.session_state['mech_hash'] = mech_hash
+    st.session_state['mechanism_path'] = mf.name
+    return mf.name
+
+
+def _png_figure(key):
+    """This plot slot's export Figure, created once per session and reused across reruns."""
+    fig = st.session_state.get(f'png_fig{key}')
+    if fig is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        # Built without pyplot, so no global figure registry holds it past the session
+        fig = Figure(figsize=(5, 3))
+        FigureCanvasAgg(fig)
+        st.session_state[f'png_fig{key}'] = fig
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=_CACHE_ENTRIES)
+def _png(z, y, ylabel, title, _fig):
+    """Render one profile to PNG bytes; cached so reruns and re-downloads skip Matplotlib."""
+    import io
+    _fig.clear()
+    ax = _fig.add_subplot()
+    ax.plot(z, y)
+    ax.set_xlabel("z (m)")
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    buf = io.BytesIO()
+    _fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+def _csv_download(results):
+    """Deferred CSV export; Streamlit calls it only when Download CSV is clicked."""
+    def build():
+        from src.output_writer import results_to_csv_bytes
+        return results_to_csv_bytes(results)
+    return build
+
+
+def _param_row(caption, widget, label, units=None, **kwargs):
+    """
+    Lay out one parameter row: caption, input widget and optional unit selector.
+
+    Every row is built by this one helper, so the column layout and the unit
+    widget key (the value key with ``_val`` replaced by ``_unit``) stay uniform.
+    Returns (value, unit); unit is None for rows without units.
+    """
+    if units is None:
+        c_caption, c_value = st.columns([1,3])
+    else:
+        c_caption, c_value, c_unit = st.columns([1,2,1])
+    c_caption.caption(caption)
+    value = getattr(c_value, widget)(label, **kwargs)
+    if units is None:
+        return value, None
+    unit_key = kwargs['key'].removesuffix('_val') + '_unit'
+    return value, c_unit.selectbox("", units, key=unit_key)
+
+
+def _freeze_inputs(inputs):
+    # Nested hashable form of the [{'value': ...}, {'units': ...}] inputs dict
+    return tuple((key, tuple(tuple(item.items()) for item in entry)) for key, entry in inputs.items())
+
+
+def _thaw_inputs(frozen):
+    return {key: [dict(item) for item in entry] for key, entry in frozen}
+
+
+@st.cache_data(show_spinner=False, max_entries=_CACHE_ENTRIES)
+def _cached_simulate(inputs_key, mech_hash, _mechanism_path):
+    """
+    Run simulate() once per distinct (inputs, mechanism contents) pair.
+
+    The mechanism is keyed by its content hash; the leading underscore keeps the
+    temp-file path out of the cache key. The SolutionArray is reduced to plain
+    ResultsArrays, which is all the UI needs and pickles cheaply into the cache.
+    """
+    results, ebal = simulate(_thaw_inputs(inputs_key), _mechanism_path)
+    return ResultsArrays.from_solution(results), ebal
+
+
+def _store_results(results):
+    # Only the plain-array bundle is kept; no Cantera objects or CSV text live in session_state
+    st.session_state['results'] = results
+    st.session_state['species_idx'] = {name: i for i, name in enumerate(results.species_names)}
+    st.session_state['plot_options'] = ("Temperature", *results.species_names, "Deposition Rate")
+
+
+# More vertices than this are invisible at chart widths; the CSV export keeps full resolution
+_MAX_PLOT_POINTS = 1000
+
+
+def _downsample(x, y, n=_MAX_PLOT_POINTS):
+    """Thin (x, y) to n evenly strided points, keeping both end points."""
+    if len(x) <= n:
+        return x, y
+    idx = np.linspace(0, len(x) - 1, n).astype(np.intp)
+    return x[idx], y[idx]
+
+
+def _series(var, species_idx, results):
+    """Return (y, ylabel) for a plot selection."""
+    if var == "Temperature":
+        return results.T, "Temperature (K)"
+    if var == "Deposition Rate":
+        return results.carbon_deposition_rate, "Carbon Deposition Rate (kg/m²/s)"
+    # Species composition
+    return results.Y[:, species_idx[var]], f"{var} Mass Fraction"
+
+
+@st.fragment
+def _render_plot(side, key):
+    """One plot column; as a fragment, changing its selectbox reruns only this column."""
+    import pandas as pd
+    state = st.session_state
+    selected_var = st.selectbox(f"Select variable to plot vs z ({side})", state['plot_options'], key=f"var{key}")
+    try:
+        results = state['results']
+        y, ylabel = _series(selected_var, state['species_idx'], results)
+        z_arr, y = _downsample(results.z, y)
+
+        # Rendered client-side; no Matplotlib work on each rerun
+        st.line_chart(pd.DataFrame({ylabel: y}, index=pd.Index(z_arr, name="z (m)")))
+
+        # Save plot button; the PNG is rendered only when the download is clicked
+        st.download_button(
+            label="Save Plot (PNG)",
+            data=lambda: _png(z_arr, y, ylabel, f"{selected_var} vs z", _png_figure(key)),
+            file_name=f"{selected_var}_vs_z.png",
+            mime="image/png",
+            key=f"download{key}"
+        )
+    except Exception as e:
+        st.error(f"Plotting error: {e}")
+
+
+@st.fragment(run_every=0.2)
+def _poll_job():
+    """Status of the background simulation; reruns on its own until the job is done."""
+    job = st.session_state.get('sim_job')
+    if job is None:
+        return
+    if job['future'].done():
+        # A full-page rerun collects the result and re-enables the Run button
+        st.rerun()
+    st.status(f"Running simulation... ({time.time() - job['start']:.0f} s)", state="running")
 
 
 def main():
@@ -22,209 +251,121 @@ def main():
     st.header("Simulation Parameters")
     st.markdown("Configure the PFR parameters below. Hover over inputs for help.")
 
-    # Validation
-    validation_errors = []
-
-    col1, col2, col3 = st.columns([1,2,1])
-    with col1: st.caption("Axial length of the reactor tube.")
-    with col2: length_val = st.number_input("Length", value=24.0, min_value=0.1, key="length_val")
-    with col3: length_unit = st.selectbox("", ["in", "m", "cm"], key="length_unit")
-
-    # Diameter
-    col1, col2, col3 = st.columns([1,2,1])
-    with col1: st.caption("Inner diameter of the reactor tube.")
-    with col2: diameter_val = st.number_input("Diameter", value=0.055, min_value=0.001, key="diameter_val")
-    with col3: diameter_unit = st.selectbox("", ["in", "m", "cm"], key="diameter_unit")
-
-    # Power
-    col1, col2, col3 = st.columns([1,2,1])
-    with col1: st.caption("Heat input power to the reactor.")
-    with col2: power_val = st.number_input("Power", value=789.0, min_value=0.0, key="power_val")
-    with col3: power_unit = st.selectbox("", ["watts", "W"], key="power_unit")
-
-    # Flow
-    col1, col2, col3 = st.columns([1,2,1])
-    with col1: st.caption("Volumetric flow rate of the fuel mixture.")
-    with col2: flow_val = st.number_input("Volumetric Flow Rate", value=53.9, min_value=0.1, key="flow_val")
-    with col3: flow_unit = st.selectbox("", ["mL/min", "L/min", "m3/s"], key="flow_unit")
-
-    # T0
-    col1, col2, col3 = st.columns([1,2,1])
-    with col1: st.caption("Temperature at reactor inlet.")
-    with col2: T0_val = st.number_input("Inlet Temperature", value=700.0, min_value=100.0, key="T0_val")
-    with col3: T0_unit = st.selectbox("", ["K", "C"], key="T0_unit")
-
-    # P0
-    col1, col2, col3 = st.columns([1,2,1])
-    with col1: st.caption("Pressure at reactor inlet.")
-    with col2: P0_val = st.number_input("Inlet Pressure", value=600.0, min_value=0.1, key="P0_val")
-    with col3: P0_unit = st.selectbox("", ["psi", "bar", "atm"], key="P0_unit")
-
-    # Slices
-    col1, col2 = st.columns([1,3])
-    with col1: st.caption("Number of axial discretization points.")
-    with col2: slices = st.number_input("Number of Slices", value=101, min_value=10, step=1, key="slices")
-
-    # Inlet comp
-    col1, col2 = st.columns([1,3])
-    with col1: st.caption("Gas composition at inlet.")
-    with col2: inlet_comp = st.text_input("Inlet Composition", value="RP2:1.0", key="inlet_comp")
-
-    # Initial cov
-    col1, col2 = st.columns([1,3])
-    with col1: st.caption("Initial surface coverages.")
-    with col2: initial_cov = st.text_input("Initial Coverages", value="CC(s):1.0", key="initial_cov")
-
-    # T_ref
-    col1, col2, col3 = st.columns([1,2,1])
-    with col1: st.caption("Reference temperature for density calculations.")
-    with col2: T_ref = st.number_input("Reference Temperature", value=300.0, min_value=100.0, key="T_ref")
-    with col3: T_ref_unit = st.selectbox("", ["K", "C"], key="T_ref_unit")
-
-    # Validate inputs
-    validation_errors = validate_inputs(
-        length_val, diameter_val, power_val, flow_val, T0_val, P0_val, slices, inlet_comp, initial_cov, T_ref
-    )
-
+    # Batch the parameter widgets in a form so editing them does not rerun the script
+    with st.form("sim_params", clear_on_submit=False):
+        length_val, length_unit = _param_row("Axial length of the reactor tube.", "number_input", "Length", ["in", "m", "cm"], value=24.0, min_value=0.1, key="length_val")
+        diameter_val, diameter_unit = _param_row("Inner diameter of the reactor tube.", "number_input", "Diameter", ["in", "m", "cm"], value=0.055, min_value=0.001, key="diameter_val")
+        power_val, power_unit = _param_row("Heat input power to the reactor.", "number_input", "Power", ["watts", "W"], value=789.0, min_value=0.0, key="power_val")
+        flow_val, flow_unit = _param_row("Volumetric flow rate of the fuel mixture.", "number_input", "Volumetric Flow Rate", ["mL/min", "L/min", "m3/s"], value=53.9, min_value=0.1, key="flow_val")
+        T0_val, T0_unit = _param_row("Temperature at reactor inlet.", "number_input", "Inlet Temperature", ["K", "C"], value=700.0, min_value=100.0, key="T0_val")
+        P0_val, P0_unit = _param_row("Pressure at reactor inlet.", "number_input", "Inlet Pressure", ["psi", "bar", "atm"], value=600.0, min_value=0.1, key="P0_val")
+        slices, _ = _param_row("Number of axial discretization points.", "number_input", "Number of Slices", value=101, min_value=10, step=1, key="slices")
+        inlet_comp, _ = _param_row("Gas composition at inlet.", "text_input", "Inlet Composition", value="RP2:1.0", key="inlet_comp")
+        initial_cov, _ = _param_row("Initial surface coverages.", "text_input", "Initial Coverages", value="CC(s):1.0", key="initial_cov")
+        T_ref, T_ref_unit = _param_row("Reference temperature for density calculations.", "number_input", "Reference Temperature", ["K", "C"], value=300.0, min_value=100.0, key="T_ref")
+
+        submitted = st.form_submit_button("Apply Parameters")
+
+    # Validate and rebuild inputs only when the parameters were (re)applied
+    if submitted or 'inputs' not in st.session_state:
+        # Re-applying unchanged values reuses the previous validation result
+        validate_args = (length_val, diameter_val, power_val, flow_val, T0_val, P0_val, slices, inlet_comp, initial_cov, T_ref)
+        if st.session_state.get('validated_args') != validate_args:
+            st.session_state['validation_errors'] = validate_inputs(*validate_args)
+            st.session_state['validated_args'] = validate_args
+        st.session_state['inputs'] = {
+            'length': [{'value': length_val}, {'units': length_unit}],
+            'diameter': [{'value': diameter_val}, {'units': diameter_unit}],
+            'power': [{'value': power_val}, {'units': power_unit}],
+            'volumetric_flow_rate': [{'value': flow_val}, {'units': flow_unit}],
+            'T0': [{'value': T0_val}, {'units': T0_unit}],
+            'P0': [{'value': P0_val}, {'units': P0_unit}],
+            'number_of_slices': [{'value': int(slices)}, {'units': ''}],
+            'inlet_composition': [{'value': inlet_comp}, {'units': ''}],
+            'initial_coverages': [{'value': initial_cov}, {'units': ''}],
+            'reference_temperature': [{'value': T_ref}, {'units': T_ref_unit}],
+        }
+
+    validation_errors = st.session_state['validation_errors']
     if validation_errors:
         for error in validation_errors:
             st.error(error)
         st.stop()  # Prevent running with invalid inputs
-
-    # Construct inputs dict
-    inputs = {
-        'length': [{'value': length_val}, {'units': length_unit}],
-        'diameter': [{'value': diameter_val}, {'units': diameter_unit}],
-        'power': [{'value': power_val}, {'units': power_unit}],
-        'volumetric_flow_rate': [{'value': flow_val}, {'units': flow_unit}],
-        'T0': [{'value': T0_val}, {'units': T0_unit}],
-        'P0': [{'value': P0_val}, {'units': P0_unit}],
-        'number_of_slices': [{'value': int(slices)}, {'units': ''}],
-        'inlet_composition': [{'value': inlet_comp}, {'units': ''}],
-        'initial_coverages': [{'value': initial_cov}, {'units': ''}],
-        'reference_temperature': [{'value': T_ref}, {'units': T_ref_unit}],
-    }
+    inputs = st.session_state['inputs']
+
+    # Collect a finished job before the Run button is drawn, so the button is
+    # not left disabled after the final poll
+    finished = st.session_state.get('sim_job')
+    if finished is not None and finished['future'].done():
+        del st.session_state['sim_job']
+        if finished['mechanism_path'] != st.session_state.get('mechanism_path'):
+            # The upload was replaced or cleared while the job was queued
+            _release_mechanism(finished['mechanism_path'])
+    else:
+        finished = None
 
     uploaded_mech = st.file_uploader("Upload Cantera mechanism YAML", type=["yaml", "yml"])
 
     if uploaded_mech is not None:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".yaml") as mf:
-            mf.write(uploaded_mech.getvalue())
-            mechanism_path = mf.name
-
-        if st.button("Run Simulation"):
-            with st.spinner("Running simulation..."):
-                try:
-                    start_time = time.time()
-                    results, _ = simulate(inputs, mechanism_path)
-                    elapsed = time.time() - start_time
-                    st.success("Simulation completed.")
-                    st.info(f"Simulation time: {elapsed:.2f} seconds | Slices: {len(results)}")
-                    st.session_state['results'] = results
-                    st.session_state['species_names'] = getattr(results, '_species_names', [])
-                    # Create CSV in memory
-                    with tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=False) as f:
-                        csv_path = write_results_to_csv(results, f.name)
-                        with open(csv_path, 'r') as rf:
-                            st.session_state['csv_data'] = rf.read()
-                        os.unlink(csv_path)
-                except Exception as e:
-                     logging.error(f"Error during simulation: {e}", exc_info=True)
-                     st.error(f"Error during simulation: {e}")
-                     st.session_state.pop('results', None)
+        # Hash each upload once; reruns with the same file reuse its digest
+        if st.session_state.get('mech_file_id') != uploaded_mech.file_id:
+            st.session_state['mech_digest'] = _upload_digest(uploaded_mech)
+            st.session_state['mech_file_id'] = uploaded_mech.file_id
+        mech_hash = st.session_state['mech_digest']
+        mechanism_path = _mechanism_file(uploaded_mech, mech_hash)
+
+        if st.button("Run Simulation", disabled='sim_job' in st.session_state):
+            # Cantera integrates off the script thread so reruns stay responsive
+            inputs_key = _freeze_inputs(inputs)
+            st.session_state['sim_job'] = {
+                'future': _executor().submit(_cached_simulate, inputs_key, mech_hash, mechanism_path),
+                'start': time.time(),
+                'mechanism_path': mechanism_path,
+            }
+            # Redraw once with the button disabled; from here only _poll_job reruns
+            st.rerun()
     else:
+        # The uploader was cleared; drop this session's copy of the mechanism
+        path = st.session_state.pop('mechanism_path', None)
+        st.session_state.pop('mech_hash', None)
+        st.session_state.pop('mech_file_id', None)
+        if path:
+            _release_mechanism(path)
         st.info("Please upload the mechanism file and configure parameters to run the simulation.")
 
+    if finished is not None:
+        try:
+            results, _ = finished['future'].result()
+            elapsed = time.time() - finished['start']
+            st.success("Simulation completed.")
+            st.info(f"Simulation time: {elapsed:.2f} seconds | Slices: {len(results)}")
+            _store_results(results)
+        except Exception as e:
+            logging.error(f"Error during simulation: {e}", exc_info=True)
+            st.error(f"Error during simulation: {e}")
+            st.session_state.pop('results', None)
+
+    if 'sim_job' in st.session_state:
+        # Only this fragment polls; earlier results stay interactive meanwhile
+        _poll_job()
+
     # Visualization
     if 'results' in st.session_state:
-        results = st.session_state['results']
-        species_names = st.session_state.get('species_names', [])
-
         st.header("Results Visualization")
-        plot_options = ["Temperature"] + species_names + ["Deposition Rate"]
 
         # Download CSV
-        if 'csv_data' in st.session_state:
-            st.download_button(
-                label="Download CSV",
-                data=st.session_state['csv_data'],
-                file_name="simulation_results.csv",
-                mime="text/csv"
-            )
+        st.download_button(
+            label="Download CSV",
+            data=_csv_download(st.session_state['results']),
+            file_name="simulation_results.csv",
+            mime="text/csv"
+        )
 
         col1, col2 = st.columns(2)
-
         with col1:
-            selected_var1 = st.selectbox("Select variable to plot vs z (Left)", plot_options, key="var1")
-            try:
-                if selected_var1 == "Temperature":
-                    y = results.T
-                    ylabel = "Temperature (K)"
-                elif selected_var1 == "Deposition Rate":
-                    y = results.carbon_deposition_rate
-                    ylabel = "Carbon Deposition Rate"
-                else:
-                    # Species composition
-                    idx = species_names.index(selected_var1)
-                    y = [row.TDY[2][idx] if hasattr(row, 'TDY') and len(row.TDY) > 2 and len(row.TDY[2]) > idx else 0 for row in results]
-                    ylabel = f"{selected_var1} Mass Fraction"
-
-                fig, ax = plot_setup()
-                ax.plot(results.z, y)
-                ax.set_xlabel("z (m)")
-                ax.set_ylabel(ylabel)
-                ax.set_title(f"{selected_var1} vs z")
-                st.pyplot(fig)
-
-                # Save plot button
-                buf = io.BytesIO()
-                fig.savefig(buf, format="png")
-                buf.seek(0)
-                st.download_button(
-                    label="Save Plot (PNG)",
-                    data=buf,
-                    file_name=f"{selected_var1}_vs_z.png",
-                    mime="image/png",
-                    key="download1"
-                )
-            except Exception as e:
-                st.error(f"Plotting error: {e}")
-
+            _render_plot("Left", 1)
         with col2:
-            selected_var2 = st.selectbox("Select variable to plot vs z (Right)", plot_options, key="var2")
-            try:
-                if selected_var2 == "Temperature":
-                    y = results.T
-                    ylabel = "Temperature (K)"
-                elif selected_var2 == "Deposition Rate":
-                    y = results.carbon_deposition_rate
-                    ylabel = "Carbon Deposition Rate (kg/m²/s)"
-                else:
-                    # Species composition
-                    idx = species_names.index(selected_var2)
-                    y = [row.TDY[2][idx] if hasattr(row, 'TDY') and len(row.TDY) > 2 and len(row.TDY[2]) > idx else 0 for row in results]
-                    ylabel = f"{selected_var2} Mass Fraction"
-
-                fig, ax = plot_setup()
-                ax.plot(results.z, y)
-                ax.set_xlabel("z (m)")
-                ax.set_ylabel(ylabel)
-                ax.set_title(f"{selected_var2} vs z")
-                st.pyplot(fig)
-
-                # Save plot button
-                buf = io.BytesIO()
-                fig.savefig(buf, format="png")
-                buf.seek(0)
-                st.download_button(
-                    label="Save Plot (PNG)",
-                    data=buf,
-                    file_name=f"{selected_var2}_vs_z.png",
-                    mime="image/png",
-                    key="download2"
-                )
-            except Exception as e:
-                st.error(f"Plotting error: {e}")
+            _render_plot("Right", 2)
 
 
 if __name__ == '__main__':